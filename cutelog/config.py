@@ -28,6 +28,12 @@ try:
 except ImportError:
     CBOR_SUPPORT = False
 
+try:
+    import orjson
+    ORJSON_SUPPORT = True
+except ImportError:
+    ORJSON_SUPPORT = False
+
 
 # @Future: when Qt 5.6 becomes standard, remove this:
 QT_VER = QT_VERSION.split('.')
@@ -95,6 +101,7 @@ class Config(QObject):
     "Configuration provider for the whole program, wrapper for QSettings"
 
     row_height_changed = Signal(int)
+    table_font_changed = Signal()
 
     def __init__(self, log=None):
         super().__init__()
@@ -121,6 +128,7 @@ class Config(QObject):
         self.logger_table_font_size = None
         self.logger_row_height = None
         self.benchmark_interval = None
+        self.time_format_string = None
 
         self.update_attributes()
 
@@ -214,7 +222,11 @@ class Config(QObject):
         self.emit_needed_changes(new_options)
         self.options.update(new_options)
         if save:
-            self.save_options()
+            # only the given options are written, the rest are either unchanged or defaults
+            self.qsettings.beginGroup('Configuration')
+            for name, value in new_options.items():
+                self.qsettings.setValue(name, value)
+            self.qsettings.endGroup()
         self.update_attributes(new_options)
 
     def update_attributes(self, options=None):
@@ -226,15 +238,23 @@ class Config(QObject):
         self.logger_table_font = options.get('logger_table_font', self.logger_table_font)
         self.logger_table_font_size = options.get('logger_table_font_size', self.logger_table_font_size)
         self.logger_row_height = options.get('logger_row_height', self.logger_row_height)
+        self.time_format_string = options.get('time_format_string', self.time_format_string)
         self.set_logging_level(options.get('console_logging_level', ROOT_LOG.level))
 
     def emit_needed_changes(self, new_options):
-        new_row_height = new_options.get('logger_row_height')
         old_row_height = self.options.get('logger_row_height')
+        new_row_height = new_options.get('logger_row_height', old_row_height)
         if new_row_height != old_row_height:
             self.logger_row_height = new_row_height
             self.row_height_changed.emit(new_row_height)
 
+        new_font = new_options.get('logger_table_font', self.logger_table_font)
+        new_font_size = new_options.get('logger_table_font_size', self.logger_table_font_size)
+        if new_font != self.logger_table_font or new_font_size != self.logger_table_font_size:
+            self.logger_table_font = new_font
+            self.logger_table_font_size = new_font_size
+            self.table_font_changed.emit()
+
     def save_options(self, sync=False):
         self.log.debug('Saving options')
         self.qsettings.beginGroup('Configuration')
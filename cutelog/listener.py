@@ -3,7 +3,7 @@ import pickle
 import struct
 import time
 
-from qtpy.QtCore import QThread, Signal
+from qtpy.QtCore import QObject, QThread, QTimer, Signal
 from qtpy.QtNetwork import QHostAddress, QTcpServer, QTcpSocket, QNetworkProxyFactory
 
 from .config import CONFIG, MSGPACK_SUPPORT, CBOR_SUPPORT
@@ -92,7 +92,7 @@ class LogServer(QTcpServer):
 
     def stop_benchmark(self):
         for thread in self.threads.copy():
-            if thread.conn_id in ("benchmark", "benchmark_monitor"):
+            if thread.conn_id == "benchmark":
                 thread.tab_closed = True
                 thread.requestInterruption()
 
@@ -272,27 +272,48 @@ class BenchmarkConnection(LogConnection):
         self.log.debug('Connection id={} has stopped'.format(self.conn_id))
 
 
-class BenchmarkMonitor(QThread):
+class BenchmarkMonitor(QObject):
+    """
+    Measures how many records per second the logger receives.
+    It runs on a timer in the GUI thread, which is also where the logger
+    counts its records, so it doesn't need a thread of its own.
+    """
+
     speed_readout = Signal(str)
+    # f-strings would be faster, but Python 3.5 is still supported
+    format_status = "{} rows/s, average: {} rows/s".format
 
     def __init__(self, main_window, logger):
         super().__init__(main_window)
         self.logger = logger
-        self.conn_id = 'benchmark_monitor'
+        self.log = logger.log
+        # running totals instead of a list of all readouts, so the average is O(1)
+        self.readouts_total = 0
+        self.readouts_count = 0
+        self.timer = QTimer(self)
+        self.timer.setInterval(500)
+        self.timer.timeout.connect(self.take_readout)
 
-    def run(self):
-        import time
-        readouts = []
-        while True:
-            if self.isInterruptionRequested():
-                break
-            time.sleep(0.5)
-            readouts.append(self.logger.monitor_count)
-            average = int(sum(readouts) / len(readouts)) * 2
-            status = "{} rows/s, average: {} rows/s".format(self.logger.monitor_count * 2, average)
-            if self.logger.monitor_count == 0:
-                continue
-            self.speed_readout.emit(status)
-            print(status, average)
-            self.logger.monitor_count = 0
-        print('Result:', int(sum(readouts) / len(readouts)) * 2, 'average')
+    def start(self):
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+        if self.readouts_count:
+            average = int(self.readouts_total / self.readouts_count) * 2
+            self.log.info('Benchmark result: %s rows/s average', average)
+        # the monitor is parented to the main window, so it'd stay alive until the app closes
+        self.deleteLater()
+
+    def take_readout(self):
+        logger = self.logger
+        count = logger.monitor_count
+        self.readouts_total += count
+        self.readouts_count += 1
+        if count == 0:
+            return
+        average = int(self.readouts_total / self.readouts_count) * 2
+        status = self.format_status(count * 2, average)
+        self.speed_readout.emit(status)
+        self.log.debug('Benchmark readout: %s', status)
+        logger.monitor_count = 0
@@ -1,12 +1,18 @@
-from collections import deque
+import fnmatch
+import re
+from collections import OrderedDict, deque
 from datetime import datetime
 from functools import partial
+from heapq import merge
+from itertools import chain, islice
+from operator import attrgetter
+from sys import intern
 
 from qtpy.QtCore import (QAbstractItemModel, QAbstractTableModel, QEvent, QItemSelectionModel,
-                         QModelIndex, QSize, QSortFilterProxyModel, Qt)
+                         QModelIndex, QSize, QSortFilterProxyModel, Qt, QTimer)
 from qtpy.QtGui import QBrush, QColor, QFont
-from qtpy.QtWidgets import (QCheckBox, QHBoxLayout, QMenu, QShortcut, QStyle,
-                            QTableWidgetItem, QWidget)
+from qtpy.QtWidgets import (QCheckBox, QHBoxLayout, QHeaderView, QMenu, QShortcut,
+                            QStyle, QTableWidgetItem, QWidget)
 
 from .config import CONFIG, Exc_Indication
 from .level_edit_dialog import LevelEditDialog
@@ -16,10 +22,19 @@ from .logger_table_header import HeaderEditDialog, LoggerTableHeader
 from .utils import loadUi, show_textview_dialog
 
 INVALID_INDEX = QModelIndex()
-SearchRole = 256
+
+# brushes and colors that don't depend on settings, so that data() doesn't construct them
+# for every cell. Indexed by dark_theme.
+EXCEPTION_BG = (QBrush(QColor(255, 180, 180), Qt.DiagCrossPattern),
+                QBrush(QColor(Qt.darkRed), Qt.DiagCrossPattern))
+INTERNAL_FG = (QColor(Qt.black), QColor(Qt.white))
+INTERNAL_BG = (QBrush(QColor(Qt.lightGray), Qt.BDiagPattern),
+               QBrush(QColor(Qt.darkGray), Qt.BDiagPattern))
 
 
 class TreeNode:
+    __slots__ = ('name', 'parent', 'children', 'path', 'row')
+
     def __init__(self, parent, name):
         self.name = name
         self.parent = parent
@@ -27,17 +42,25 @@ class TreeNode:
         self.path = None
         self.row = 0
         if parent:
-            result = [name]
-            cur_parent = parent
-            while cur_parent.parent is not None:
-                result.insert(0, cur_parent.name)
-                cur_parent = cur_parent.parent
-            self.path = '.'.join(result)
+            # the parent's path is already known, so there's no need to walk up the tree
+            if parent.parent is None:
+                self.path = name
+            else:
+                self.path = parent.path + '.' + name
             self.row = len(self.parent.children)
 
     def is_descendant_of(self, node_path):
         return self.path.startswith(node_path + '.')
 
+    def has_ancestor_in(self, paths):
+        "Checks if any of this node's ancestors has a path from the given set"
+        node = self.parent
+        while node is not None:
+            if node.path in paths:
+                return True
+            node = node.parent
+        return False
+
     def __repr__(self):
         return "{}(name={}, path={})".format(self.__class__.__name__, self.name, self.path)
 
@@ -88,27 +111,27 @@ class LogNamespaceTreeModel(QAbstractItemModel):
             return len(node.children)
 
     def register_logger(self, full_name):
-        if full_name in self.registry:  # if name is already registred, return it
-            return self.registry[full_name]
-        else:
-            parts = full_name.rsplit('.', 1)  # split off the last name only
-            name = parts[-1]
-
-            if len(parts) == 1:
-                parent = self.root
-                parent_index = INVALID_INDEX
-            else:
-                parent = self.register_logger(parts[0])
-                parent_index = self.createIndex(parent.row, 0, parent)
-
-            row = len(parent.children)
-
-            self.beginInsertRows(parent_index, row, row)
-            result = TreeNode(parent, name)
-            parent.children.append(result)
-            self.registry[full_name] = result
-            self.endInsertRows()
-            return result
+        registry = self.registry
+        if full_name in registry:  # if name is already registred, return it
+            return registry[full_name]
+
+        # walk down the tree in one pass, creating the missing nodes along the way
+        parent = self.root
+        parent_index = INVALID_INDEX
+        path = None
+        for name in full_name.split('.'):
+            path = name if path is None else path + '.' + name
+            node = registry.get(path)
+            if node is None:
+                row = len(parent.children)
+                self.beginInsertRows(parent_index, row, row)
+                node = TreeNode(parent, name)
+                parent.children.append(node)
+                registry[path] = node
+                self.endInsertRows()
+            parent = node
+            parent_index = self.createIndex(node.row, 0, node)
+        return parent
 
     def columnCount(self, parent=None):
         return 1
@@ -129,6 +152,11 @@ class LogRecord:
     It's used to avoid creation of useless fields that logging.makeLogRecord produces,
     as well as imitate some of its behavior.
     """
+    # the buffer can hold a lot of records, so they don't get a __dict__ of their own.
+    # Unset slots still fall through to __getattr__, so the lazy ones keep working.
+    __slots__ = ('message', 'levelname', 'created', 'name', 'exc_text', '_cutelog', '_logDict',
+                 'asctime', '_lower_message', '_extra_cache')
+
     def __init__(self, logDict):
         # this is what logging.Formatter (for asctime) did previously, but it didn't delete "msg"
         self.message = logDict.get("message")
@@ -140,7 +168,9 @@ class LogRecord:
         if self.levelname is None:
             self.levelname = logDict.get("level")
         if self.levelname is not None:
-            self.levelname = self.levelname.upper()
+            # there are only a few distinct level names, so all records share the same string
+            # objects, which saves memory and makes dict lookups by levelname cheaper
+            self.levelname = intern(self.levelname.upper())
 
         self.created = logDict.get("created")
         if self.created is None:
@@ -150,20 +180,29 @@ class LogRecord:
         if self.created is None or type(self.created) not in (int, float):
             self.created = datetime.now().timestamp()
 
+        # these are read for every record when filtering and for every cell when painting,
+        # so they're made into real attributes to avoid going through __getattr__
+        self.name = logDict.get("name")
+        self.exc_text = logDict.get("exc_text")
+        self._cutelog = logDict.get("_cutelog")
+
         self._logDict = logDict
-        self.generate_asctime()
 
     def __getattr__(self, name):
-        try:
-            return self.__dict__[name]
-        except Exception:
-            return self._logDict.get(name)
+        # this only gets called for attributes that aren't set on the instance
+        # asctime is generated on first access, so records that never get displayed
+        # don't pay for the strftime call
+        if name == 'asctime':
+            self.generate_asctime()
+            return self.asctime
+        return self._logDict.get(name)
 
     def __repr__(self):
         return str(self._logDict)
 
     def generate_asctime(self):
-        fmt = CONFIG['time_format_string']
+        # time.strftime would avoid creating a datetime, but it doesn't support %f
+        fmt = CONFIG.time_format_string
         if fmt:
             try:
                 self.asctime = datetime.fromtimestamp(self.created).strftime(fmt)
@@ -187,6 +226,13 @@ class LogRecordModel(QAbstractTableModel):
         self.extra_mode = CONFIG['extra_mode_default']
         self.word_wrap = CONFIG['word_wrap_default']
         self.sort_by_time = CONFIG['sort_by_time']
+        # (levelname, dark_theme) -> (font, fg, bg); these get requested for every cell
+        # on every repaint, so they're computed once per level instead of every time
+        self.level_styles = {}
+        self.plain_font = None
+        # number of lines -> QSize, for the row height in row_sizes_height
+        self.row_sizes = {}
+        self.row_sizes_height = None
 
     def columnCount(self, index):
         return self.table_header.column_count
@@ -200,69 +246,96 @@ class LogRecordModel(QAbstractTableModel):
 
         result = None
         record = self.records[index.row()]
-        if getattr(record, '_cutelog', False):
+        if record._cutelog:
             return self.data_internal(index, record, role)
 
         if role == Qt.DisplayRole:
-            column_name = self.table_header[index.column()].name
+            column_name = self.table_header.visible_names_by_index[index.column()]
             if self.extra_mode and column_name == "message":
-                result = self.get_extra(record.message, record)
+                result = self.get_extra(record)[0]
             else:
                 result = getattr(record, column_name, None)
         elif role == Qt.SizeHintRole:
-            if self.table_header[index.column()].name != 'message':
-                return QSize(1, CONFIG.logger_row_height)
+            if self.table_header.visible_names_by_index[index.column()] != 'message':
+                return self.get_row_size()
             if self.word_wrap:
                 return None
             if self.extra_mode:
-                return QSize(1, CONFIG.logger_row_height *
-                             (1 + len(self.get_fields_for_extra(record))))
+                return self.get_row_size(1 + self.get_extra(record)[1])
             else:
-                return QSize(1, CONFIG.logger_row_height)
+                return self.get_row_size()
         elif role == Qt.DecorationRole:
-            if self.table_header[index.column()].name == 'message':
+            if self.table_header.visible_names_by_index[index.column()] == 'message':
                 if record.exc_text:
                     mode = CONFIG['exception_indication']
                     should = mode in (Exc_Indication.MSG_ICON, Exc_Indication.ICON_AND_RED_BG)
                     if should:
                         result = self.parent_widget.style().standardIcon(QStyle.SP_BrowserStop)
         elif role == Qt.FontRole:
-            level = self.levels.get(record.levelname, NO_LEVEL)
-            styles = level.styles if not self.dark_theme else level.stylesDark
-            result = QFont(CONFIG.logger_table_font, CONFIG.logger_table_font_size)
-            if styles:
-                if 'bold' in styles:
-                    result.setBold(True)
-                if 'italic' in styles:
-                    result.setItalic(True)
-                if 'underline' in styles:
-                    result.setUnderline(True)
+            result = self.get_level_style(record.levelname)[0]
         elif role == Qt.ForegroundRole:
-            level = self.levels.get(record.levelname, NO_LEVEL)
-            if not self.dark_theme:
-                result = level.fg
-            else:
-                result = level.fgDark
+            result = self.get_level_style(record.levelname)[1]
         elif role == Qt.BackgroundRole:
             if record.exc_text:
                 mode = CONFIG['exception_indication']
                 should = mode in (Exc_Indication.RED_BG, Exc_Indication.ICON_AND_RED_BG)
                 if should:
-                    if not self.dark_theme:
-                        color = QColor(255, 180, 180)
-                    else:
-                        color = Qt.darkRed
-                    result = QBrush(color, Qt.DiagCrossPattern)
-                    return result
-            level = self.levels.get(record.levelname, NO_LEVEL)
-            if not self.dark_theme:
-                result = level.bg
-            else:
-                result = level.bgDark
-        elif role == SearchRole:
-            result = record.message
+                    return EXCEPTION_BG[self.dark_theme]
+            result = self.get_level_style(record.levelname)[2]
         return result
 
+    def get_level_style(self, levelname):
+        key = (levelname, self.dark_theme)
+        style = self.level_styles.get(key)
+        if style is not None:
+            return style
+
+        level = self.levels.get(levelname)
+        # levels that aren't registered yet aren't cached, so they get picked up once they are
+        cache = level is not None
+        if level is None:
+            level = NO_LEVEL
+        if not self.dark_theme:
+            styles, fg, bg = level.styles, level.fg, level.bg
+        else:
+            styles, fg, bg = level.stylesDark, level.fgDark, level.bgDark
+        font = QFont(CONFIG.logger_table_font, CONFIG.logger_table_font_size)
+        if styles:
+            if 'bold' in styles:
+                font.setBold(True)
+            if 'italic' in styles:
+                font.setItalic(True)
+            if 'underline' in styles:
+                font.setUnderline(True)
+        style = (font, fg, bg)
+        if cache:
+            self.level_styles[key] = style
+        return style
+
+    def get_row_size(self, lines=1):
+        # Qt copies the size when it's returned, so the same instance can be handed out
+        # every time; it only has to be recreated when the row height setting changes
+        height = CONFIG.logger_row_height
+        if height != self.row_sizes_height:
+            self.row_sizes.clear()
+            self.row_sizes_height = height
+        size = self.row_sizes.get(lines)
+        if size is None:
+            size = QSize(1, height * lines)
+            self.row_sizes[lines] = size
+        return size
+
+    def get_plain_font(self):
+        font = self.plain_font
+        if font is None:
+            font = QFont(CONFIG.logger_table_font, CONFIG.logger_table_font_size)
+            self.plain_font = font
+        return font
+
+    def clear_style_cache(self):
+        self.level_styles.clear()
+        self.plain_font = None
+
     def data_internal(self, index, record, role):
         result = None
         if role == Qt.DisplayRole:
@@ -273,29 +346,33 @@ class LogRecordModel(QAbstractTableModel):
                 if column.name == 'asctime':
                     result = record.asctime
         elif role == Qt.SizeHintRole:
-            result = QSize(1, CONFIG.logger_row_height)
+            result = self.get_row_size()
         elif role == Qt.FontRole:
-            result = QFont(CONFIG.logger_table_font, CONFIG.logger_table_font_size)
+            result = self.get_plain_font()
         elif role == Qt.ForegroundRole:
-            if not self.dark_theme:
-                result = QColor(Qt.black)
-            else:
-                result = QColor(Qt.white)
+            result = INTERNAL_FG[self.dark_theme]
         elif role == Qt.BackgroundRole:
-            if not self.dark_theme:
-                color = QColor(Qt.lightGray)
-            else:
-                color = QColor(Qt.darkGray)
-            result = QBrush(color, Qt.BDiagPattern)
+            result = INTERNAL_BG[self.dark_theme]
         return result
 
     def get_fields_for_extra(self, record):
         # this is a tiny bit slower than a set difference, but preserves order
         return [field for field in record._logDict if field not in self.table_header.visible_names]
 
-    def get_extra(self, msg, record):
+    def get_extra(self, record):
+        """
+        Returns the message with extra fields appended and the number of those fields.
+        The result is cached on the record until the header or word wrap changes.
+        """
+        # versions are counted per header, and merged records come from another tab's header
+        key = (id(self.table_header), self.table_header.version, self.word_wrap)
+        cached = record._extra_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
         fields = self.get_fields_for_extra(record)
         result = ["{}={}".format(field, record._logDict[field]) for field in fields]
+        msg = record.message
         if msg is not None:
             # annoying, but otherwise extra args get cut off by the message
             if not self.word_wrap:
@@ -303,7 +380,9 @@ class LogRecordModel(QAbstractTableModel):
                 if len(msg_spl) > 1:
                     msg = "{}…".format(msg_spl[0])
             result.insert(0, msg)
-        return "\n".join(result)
+        extra = ("\n".join(result), len(fields))
+        record._extra_cache = (key, extra)
+        return extra
 
     def headerData(self, section, orientation=Qt.Horizontal, role=Qt.DisplayRole):
         result = None
@@ -311,6 +390,30 @@ class LogRecordModel(QAbstractTableModel):
             result = self.table_header[section].title
         return result
 
+    def add_records(self, records):
+        "Adds a batch of records, returns the lowest row that they were inserted at"
+        if not records:
+            return len(self.records)
+        if self.sort_by_time and len(records) > 1:
+            # sorted() instead of list.sort(), so the caller's list is left as it was
+            records = sorted(records, key=attrgetter('created'))
+        if self.max_capacity != 0 and len(records) > self.max_capacity:
+            records = records[-self.max_capacity:]
+        self.trim_if_needed(len(records))
+        row = len(self.records)
+
+        # usually records arrive in order, so the whole batch can be inserted at once
+        if row == 0 or not self.sort_by_time or records[0].created > self.records[-1].created:
+            self.beginInsertRows(INVALID_INDEX, row, row + len(records) - 1)
+            self.records.extend(records)
+            self.endInsertRows()
+            return row
+        else:
+            first_row = row
+            for record in records:
+                first_row = min(first_row, self.add_record(record, internal=True))
+            return first_row
+
     def add_record(self, record, internal=False):
         if not internal:
             self.trim_if_needed()
@@ -331,34 +434,68 @@ class LogRecordModel(QAbstractTableModel):
         return row
 
     def trim_except_last_n(self, n):
-        from itertools import islice
         start = len(self.records) - n
-        if start < 0:
+        if start <= 0:
             return
         self.beginRemoveRows(INVALID_INDEX, 0, start - 1)
-        new_records = deque(islice(self.records, start, None))
-        self.records.clear()
-        del self.records
-        self.records = new_records
+        if n == 0:
+            # happens every time a new connection clears the tab, no need to copy anything
+            self.records.clear()
+        elif start <= n:
+            self.pop_first_n(start)
+        else:
+            # when most records go, copying the few that stay is cheaper than popping the rest
+            new_records = deque(islice(self.records, start, None))
+            self.records.clear()
+            del self.records
+            self.records = new_records
         self.endRemoveRows()
 
-    def trim_if_needed(self):
+    def trim_if_needed(self, incoming=1):
+        "Removes the oldest records to make room for the incoming ones"
         if self.max_capacity == 0 or len(self.records) == 0:
             return
-        diff = len(self.records) - self.max_capacity
-        if len(self.records) >= self.max_capacity:
-            self.beginRemoveRows(INVALID_INDEX, 0, diff)
-            while len(self.records) >= self.max_capacity:
-                self.records.popleft()
+        diff = min(len(self.records) + incoming - self.max_capacity, len(self.records))
+        if diff > 0:
+            self.beginRemoveRows(INVALID_INDEX, 0, diff - 1)
+            self.pop_first_n(diff)
             self.endRemoveRows()
 
+    def pop_first_n(self, n):
+        # deque is already a ring of preallocated blocks, so popleft is O(1) and doesn't
+        # move the rest of the records
+        popleft = self.records.popleft
+        for _ in range(n):
+            popleft()
+
     def merge_with_records(self, new_records):
         self.beginResetModel()
-        from itertools import chain
-        from operator import attrgetter  # works faster than lambda, but not in pypy3
-        new_records = deque(sorted(chain(self.records, new_records), key=attrgetter('created')))
-        del self.records
-        self.records = new_records
+        key = attrgetter('created')  # works faster than lambda, but not in pypy3
+        # only the newest max_capacity records would survive the next trim anyway
+        excess = 0
+        if self.max_capacity != 0:
+            excess = max(len(self.records) + len(new_records) - self.max_capacity, 0)
+        if not self.sort_by_time:
+            merged = sorted(chain(self.records, new_records), key=key)
+            new_records = deque(islice(merged, excess, None))
+            del self.records
+            self.records = new_records
+        else:
+            # existing records are already sorted by time, so only the new ones need sorting
+            new_records = sorted(new_records, key=key)
+            if len(self.records) == 0 or len(new_records) == 0 or \
+               new_records[0].created >= self.records[-1].created:
+                old_len = len(self.records)
+                if excess >= old_len:
+                    self.records.clear()
+                    self.records.extend(islice(new_records, excess - old_len, None))
+                else:
+                    self.pop_first_n(excess)
+                    self.records.extend(new_records)
+            else:
+                merged = deque(islice(merge(self.records, new_records, key=key), excess, None))
+                del self.records
+                self.records = merged
         self.endResetModel()
 
     def clear(self):
@@ -370,6 +507,18 @@ class LogRecordModel(QAbstractTableModel):
         return self.records[pos]
 
 
+class AcceptedKeysCache(dict):
+    "Remembers which (levelname, name) pairs pass the filter"
+
+    def __init__(self, accepted):
+        super().__init__()
+        self.accepted = accepted
+
+    def __missing__(self, key):
+        result = self[key] = self.accepted(*key)
+        return result
+
+
 class RecordFilter(QSortFilterProxyModel):
     def __init__(self, parent, namespace_tree_model, level_filter):
         super().__init__(parent)
@@ -377,86 +526,138 @@ class RecordFilter(QSortFilterProxyModel):
         self.level_filter = level_filter
         self.selection_includes_children = True
         self.search_filter = False
+        self.search_regexp = False
+        self.search_casesensitive = False
+        self.search_match = None
+        self.accepted_rows = None
+        self.update_namespace_filter()
         self.clear_filter()
 
     def filterAcceptsRow(self, sourceRow, sourceParent):
-        record = self.sourceModel().get_record(sourceRow)
-        if record.levelname not in self.level_filter:
+        if self.accepted_rows is not None:
+            return self.accepted_rows[sourceRow] == 1
+        return self.record_accepted(self.sourceModel().get_record(sourceRow))
+
+    def record_accepted(self, record):
+        if not self.level_and_name_accepted(record.levelname, record.name):
             return False
-        else:
-            result = True
-            selected_nodes = self.namespace_tree_model.selected_nodes
-            if len(selected_nodes) == 0:
-                result = True
-            else:
-                for node in selected_nodes:
-                    path = node.path
-                    if path == '':
-                        result = True
-                        break
-                    if path:
-                        name = record.name
-                        # name is None for record added by method add_conn_closed_record().
-                        if name is None:
-                            result = False
-                        elif name == path:
-                            result = True
-                            break
-                        elif not self.selection_includes_children and name == path:
-                            result = True
-                            break
-                        elif self.selection_includes_children and name.startswith(path + '.'):
-                            result = True
-                            break
-                        else:
-                            result = False
-        if result and self.search_filter:
+        if self.search_filter:
             msg = record.message
             if msg is None:
                 return False
-            regexp = self.filterRegExp()
-            if not regexp.isEmpty():
-                return regexp.exactMatch(msg)
+            if self.search_regexp:
+                # an invalid pattern doesn't match anything
+                if self.search_match is None:
+                    return False
+                return self.search_match(msg) is not None
             else:
-                if self.filterCaseSensitivity() == Qt.CaseInsensitive:
-                    msg = msg.lower()
+                if not self.search_casesensitive:
+                    # lowercasing every message on every keystroke is wasteful,
+                    # so each record does it at most once and keeps the result
+                    lower_msg = record._lower_message
+                    if lower_msg is None:
+                        lower_msg = msg.lower()
+                        record._lower_message = lower_msg
+                    msg = lower_msg
                 return self.filter_string in msg
+        return True
+
+    def level_and_name_accepted(self, levelname, name):
+        if levelname not in self.level_filter:
+            return False
+        if not self.all_names_accepted:
+            # name is None for record added by method add_conn_closed_record().
+            if name is None:
+                return False
+            # str.startswith accepts a tuple of prefixes and checks them all in C
+            if name not in self.selected_paths and not name.startswith(self.selected_prefixes):
+                return False
+        return True
+
+    def update_namespace_filter(self):
+        "Precomputes everything filterAcceptsRow needs to know about the selected namespaces"
+        paths = set(node.path for node in self.namespace_tree_model.selected_nodes)
+        self.all_names_accepted = len(paths) == 0 or '' in paths
+        self.selected_paths = frozenset(paths)
+        if self.selection_includes_children:
+            self.selected_prefixes = tuple(path + '.' for path in paths)
         else:
-            return result
-        return False
+            self.selected_prefixes = tuple()
+
+    def invalidateFilter(self):
+        self.update_namespace_filter()
+        source_model = self.sourceModel()
+        if source_model is not None:
+            # Qt re-checks every row right away, so it's faster to compute all
+            # the answers in one pass than to look up each record separately
+            if self.search_filter:
+                self.accepted_rows = bytearray(map(self.record_accepted, source_model.records))
+            else:
+                # without a search the answer only depends on the level and the name,
+                # so it's computed once per pair and the loop over records stays in C
+                keys = map(attrgetter('levelname', 'name'), source_model.records)
+                accepted = AcceptedKeysCache(self.level_and_name_accepted)
+                self.accepted_rows = bytearray(map(accepted.__getitem__, keys))
+        super().invalidateFilter()
+        # rows get inserted and trimmed after this, so the answers are only valid until now
+        self.accepted_rows = None
 
     def set_filter(self, string, regexp, wildcard, casesensitive):
-        if regexp:
-            self.setFilterRegExp(string)
-        elif wildcard:
-            self.setFilterWildcard(string)
+        # Qt's filter case sensitivity is left alone, since changing it makes Qt
+        # refilter all rows before invalidateFilter does it again
+        self.search_casesensitive = casesensitive
+        if regexp or wildcard:
+            self.search_regexp = True
+            self.search_match = self.pattern_matcher(string, regexp, casesensitive)
         else:
+            self.search_regexp = False
             if not casesensitive:
                 string = string.lower()
             self.filter_string = string
-            self.setFilterRegExp("")
 
         self.search_filter = True
-        self.setFilterCaseSensitivity(casesensitive)
         self.invalidateFilter()
 
+    def pattern_matcher(self, string, regexp, casesensitive):
+        """
+        Returns a function that matches a message against a regexp or wildcard search,
+        or None if the pattern is invalid. Used by both filtering and Find.
+        """
+        if regexp:
+            # regular expressions match anywhere in the message, like the plain search does
+            pattern = self.compile_pattern(string, casesensitive)
+            return pattern.search if pattern is not None else None
+        # wildcards have to match the whole message, same as in a shell
+        pattern = self.compile_pattern(fnmatch.translate(string), casesensitive)
+        return pattern.fullmatch if pattern is not None else None
+
+    def compile_pattern(self, pattern, casesensitive):
+        # Python's re is used instead of QRegExp because it doesn't need to convert
+        # every message to a QString, and QRegExp is deprecated in Qt 5
+        try:
+            return re.compile(pattern, 0 if casesensitive else re.IGNORECASE)
+        except re.error:
+            return None
+
     def clear_filter(self):
         self.search_filter = False
+        self.search_regexp = False
+        self.search_match = None
         self.filter_string = ""
-        self.setFilterRegExp("")
         self.invalidateFilter()
 
 
 class DetailTableModel(QAbstractTableModel):
     def __init__(self, parent):
         super().__init__(parent)
-        self.record = tuple()
+        self.fields = {}
+        self.names = tuple()
 
     def columnCount(self, index):
         return 2
 
     def rowCount(self, index):
-        return len(self.record)
+        return len(self.names)
 
     def headerData(self, section, orientation, role):
         if orientation == Qt.Horizontal and role == Qt.DisplayRole:
@@ -465,15 +666,17 @@ class DetailTableModel(QAbstractTableModel):
 
     def data(self, index, role=Qt.DisplayRole):
         if index.isValid():
-            row, column = index.row(), index.column()
             if role == Qt.DisplayRole:
-                row = self.record[index.row()]
-                data = str(row[column]) if row[column] is not None else row[column]
-                return data
+                name = self.names[index.row()]
+                if index.column() == 0:
+                    return name
+                value = self.fields[name]
+                return str(value) if value is not None else value
         return None
 
     def clear(self):
-        self.record = tuple()
+        self.fields = {}
+        self.names = tuple()
         self.reset()
 
     def reset(self):
@@ -481,14 +684,23 @@ class DetailTableModel(QAbstractTableModel):
         self.endResetModel()
 
     def set_record(self, record):
-        record_dict = record._logDict.copy()  # copy to prevent editing the actual record
-        self.record = tuple(record_dict.items())
-        self.reset()
+        # records aren't changed after they're received, so the dict can be shared
+        # and the values are only looked up for the rows that get displayed
+        names = tuple(record._logDict)
+        same_size = len(names) == len(self.names)
+        self.fields = record._logDict
+        self.names = names
+        if same_size and len(names) > 0:
+            # resetting the whole model is only needed when rows appear or disappear
+            self.dataChanged.emit(self.index(0, 0), self.index(len(names) - 1, 1))
+        else:
+            self.reset()
 
     def open_row_popup(self, index):
-        row = self.record[index.row()]
-        text = str(row[1]) if row[1] is not None else row[1]
-        show_textview_dialog(self.parent(), 'Field "{}"'.format(row[0]), text)
+        name = self.names[index.row()]
+        value = self.fields[name]
+        text = str(value) if value is not None else value
+        show_textview_dialog(self.parent(), 'Field "{}"'.format(name), text)
 
 
 class LoggerTab(QWidget):
@@ -506,10 +718,18 @@ class LoggerTab(QWidget):
         self.autoscroll = True
         self.scroll_max = 0
         self.monitor_count = 0  # for monitoring
-        self.connections = []
+        self.connections = set()
         if connection is not None:
-            self.connections.append(connection)
+            self.connections.add(connection)
         self.last_status_update_time = 0
+        self.pending_row_height = None
+        self.row_height_update_scheduled = False
+        self.pending_records = []
+        self.pending_resize_rows = False
+        self.level_checkboxes = []  # indexed by row in levelsTable
+        self.header_dialog = None
+        self.invalidating = False
+        self.detail_outdated = False
         self.extra_mode = CONFIG['extra_mode_default']
         self.word_wrap = CONFIG['word_wrap_default']
 
@@ -531,6 +751,20 @@ class LoggerTab(QWidget):
         self.table_header = LoggerTableHeader(self.loggerTable.horizontalHeader())
         self.record_model = LogRecordModel(self, self.level_filter.levels, self.table_header)
 
+        # records are added in batches, so a busy connection doesn't cause a model insert,
+        # a row resize and a scroll for every single record
+        self.record_batch_timer = QTimer(self)
+        self.record_batch_timer.setSingleShot(True)
+        self.record_batch_timer.setInterval(16)
+        self.record_batch_timer.timeout.connect(self.flush_pending_records)
+
+        # same for filter invalidation: clicking through levels or namespaces shouldn't
+        # re-filter and resize all rows on every click
+        self.invalidate_timer = QTimer(self)
+        self.invalidate_timer.setSingleShot(True)
+        self.invalidate_timer.setInterval(150)
+        self.invalidate_timer.timeout.connect(self.apply_filter_invalidation)
+
         self.loggerTable.verticalScrollBar().rangeChanged.connect(self.onRangeChanged)
         self.loggerTable.verticalScrollBar().valueChanged.connect(self.onScroll)
         self.loggerTable.setContextMenuPolicy(Qt.CustomContextMenu)
@@ -542,6 +776,9 @@ class LoggerTab(QWidget):
             self.loggerTable.setVerticalScrollMode(self.loggerTable.ScrollPerPixel)
             self.detailTable.setWordWrap(True)
 
+        # rows are only ever resized by the program, so the header doesn't need to
+        # consult the rows' size hints when laying itself out
+        self.loggerTable.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         self.loggerTable.verticalHeader().setDefaultSectionSize(CONFIG['logger_row_height'])
 
         self.namespaceTreeView.setModel(self.namespace_tree_model)
@@ -553,7 +790,8 @@ class LoggerTab(QWidget):
         self.namespace_tree_model.rowsInserted.connect(self.on_tree_rows_inserted)
 
         for levelname, level in self.level_filter.levels.items():
-            self.add_level_to_table(level)
+            self.add_level_to_table(level, resize_column=False)
+        self.levelsTable.resizeColumnToContents(1)
         self.levelsTable.doubleClicked.connect(self.level_double_clicked)
         self.levelsTable.installEventFilter(self)
         self.levelsTable.setContextMenuPolicy(Qt.CustomContextMenu)
@@ -572,7 +810,9 @@ class LoggerTab(QWidget):
 
         self.table_header_view = header = self.loggerTable.horizontalHeader()
         header.setStretchLastSection(True)
-        self.loggerTable.resizeColumnsToContents()
+        # column widths come from the header preset (see set_columns_sizes), so Qt never
+        # needs to measure cell contents to size them
+        header.setSectionResizeMode(QHeaderView.Interactive)
         header.viewport().installEventFilter(self.table_header)  # read the docstring
         header.setContextMenuPolicy(Qt.CustomContextMenu)
         header.customContextMenuRequested.connect(self.open_header_menu)
@@ -634,6 +874,7 @@ class LoggerTab(QWidget):
 
     def setup_internal_connections(self):
         CONFIG.row_height_changed.connect(self.row_height_changed)
+        CONFIG.table_font_changed.connect(self.record_model.clear_style_cache)
 
     def filter_or_clear(self):
         self.search_filter = not self.search_filter
@@ -667,29 +908,41 @@ class LoggerTab(QWidget):
         selected = self.levelsTable.selectedIndexes()
         for index in selected:
             if index.column() == 0:
-                checkbox = self.levelsTable.cellWidget(index.row(), index.column()).children()[1]
-                checkbox.toggle()
+                self.level_checkboxes[index.row()].toggle()
         self.invalidate_filter(resize_rows=True)
 
     def search_down(self):
-        start = self.filter_model.index(self.search_start, 0, INVALID_INDEX)
         s = self.searchLine.text()
-
-        if not self.search_regex:
-            search_flags = Qt.MatchContains
+        # messages are matched the same way the filter matches them
+        if self.search_regex or self.search_wildcard:
+            matches = self.filter_model.pattern_matcher(s, self.search_regex,
+                                                        self.search_casesensitive)
+        elif self.search_casesensitive:
+            def matches(msg):
+                return s in msg
         else:
-            search_flags = Qt.MatchRegExp
-        if self.search_casesensitive:
-            search_flags = search_flags | Qt.MatchCaseSensitive
-        if self.search_wildcard:
-            search_flags = search_flags | Qt.MatchWildcard
-
-        hits = self.filter_model.match(start, SearchRole, s, 1, Qt.MatchWrap | search_flags)
-        if not hits:
+            s_lower = s.lower()
+
+            def matches(msg):
+                return s_lower in msg.lower()
+
+        model = self.loggerTable.model()
+        row_count = model.rowCount()
+        start = self.search_start if self.search_start < row_count else 0
+        result = None
+        if matches is not None:
+            # starts after the previous hit and wraps around to the top
+            for row in chain(range(start, row_count), range(start)):
+                index = model.index(row, 0)
+                msg = self.get_record(index).message
+                if msg is not None and matches(msg):
+                    result = index
+                    break
+
+        if result is None:
             self.log.warn('No matches for {}'.format(s))
             self.search_start = 0
         else:
-            result = hits[0]
             self.search_start = result.row() + 1
             self.loggerTable.scrollTo(result)
             self.loggerTable.setCurrentIndex(result)
@@ -718,30 +971,56 @@ class LoggerTab(QWidget):
         self.set_search_visible(not self.search_bar_visible)
 
     def on_record(self, record):
-        levelname = record.levelname
-        if levelname:
-            self.process_level(levelname)
-        src_row = self.record_model.add_record(record)
-        if record.name:
-            self.register_logger(record.name)
-        self.monitor_count += 1
-
-        src_index = self.record_model.index(src_row, 0, INVALID_INDEX)
-        table_row = self.filter_model.mapFromSource(src_index).row()
-        if table_row == -1:
+        self.pending_records.append(record)
+        if not self.record_batch_timer.isActive():
+            self.record_batch_timer.start()
+
+    def flush_pending_records(self):
+        self.record_batch_timer.stop()
+        if not self.pending_records:
             return
+        records = self.pending_records
+        self.pending_records = []
 
-        if self.word_wrap:
-            self.loggerTable.resizeRowToContents(table_row)
-        elif self.extra_mode:
-            self.loggerTable.setRowHeight(table_row,
-                            CONFIG.logger_row_height * (1 + len(self.record_model.get_fields_for_extra(record))))
-        else:
-            self.loggerTable.setRowHeight(table_row, CONFIG.logger_row_height)
+        self.register_names_and_levels(records)
+        self.monitor_count += len(records)
+        first_row = self.record_model.add_records(records)
+
+        # new rows already have the default height, so only these modes need resizing
+        if self.word_wrap or self.extra_mode:
+            self.resize_rows_from(first_row)
 
         if self.autoscroll:
             self.loggerTable.scrollToBottom()
 
+    def resize_rows(self):
+        """
+        Resizes all rows to fit their contents. Only word wrap actually needs Qt to measure
+        the contents, in other modes the height of each row is already known.
+        """
+        if self.word_wrap:
+            self.loggerTable.resizeRowsToContents()
+        elif self.extra_mode:
+            self.resize_rows_from(0)
+        else:
+            # setting the default size resizes every row in one call on the C++ side
+            self.loggerTable.verticalHeader().setDefaultSectionSize(CONFIG.logger_row_height)
+
+    def resize_rows_from(self, first_src_row):
+        record_model = self.record_model
+        for src_row in range(first_src_row, record_model.rowCount()):
+            src_index = record_model.index(src_row, 0, INVALID_INDEX)
+            table_row = self.filter_model.mapFromSource(src_index).row()
+            if table_row == -1:
+                continue
+            if self.word_wrap:
+                self.loggerTable.resizeRowToContents(table_row)
+            else:
+                record = record_model.get_record(src_row)
+                extra_count = record_model.get_extra(record)[1]
+                self.loggerTable.setRowHeight(table_row,
+                                              CONFIG.logger_row_height * (1 + extra_count))
+
     def add_conn_closed_record(self, conn):
         record = LogRecord({'_cutelog': 'Connection {} closed'.format(conn.conn_id), 'created': datetime.now().timestamp()})
         self.on_record(record)
@@ -757,6 +1036,24 @@ class LoggerTab(QWidget):
     def register_logger(self, name):
         self.namespace_tree_model.register_logger(name)
 
+    def register_names_and_levels(self, records):
+        # a batch usually comes from a handful of loggers and levels, so each one is
+        # only looked up once. OrderedDict keeps the order in which they first appeared
+        # (plain dicts are unordered on 3.5)
+        names = OrderedDict.fromkeys(record.name for record in records if record.name)
+        levelnames = OrderedDict.fromkeys(record.levelname for record in records
+                                          if record.levelname)
+        # after the first few batches everything is already known, so the dicts that already
+        # hold all names and levels are checked before calling into the models
+        known_levels = self.level_filter.levels
+        for levelname in levelnames:
+            if levelname not in known_levels:
+                self.process_level(levelname)
+        known_names = self.namespace_tree_model.registry
+        for name in names:
+            if name not in known_names:
+                self.register_logger(name)
+
     def process_level(self, levelname):
         levelname = levelname.upper()
         level = self.level_filter.levels.get(levelname)
@@ -768,7 +1065,7 @@ class LoggerTab(QWidget):
         self.add_level_to_table(new_level)
         return new_level
 
-    def add_level_to_table(self, level):
+    def add_level_to_table(self, level, resize_column=True):
         row_count = self.levelsTable.rowCount()
         self.levelsTable.setRowCount(row_count + 1)
 
@@ -789,8 +1086,12 @@ class LoggerTab(QWidget):
         checkbox_widget.setLayout(checkbox_layout)
 
         self.levelsTable.setCellWidget(row_count, 0, checkbox_widget)
+        self.level_checkboxes.append(checkbox)
         self.levelsTable.setItem(row_count, 1, QTableWidgetItem(level.levelname))
-        self.levelsTable.resizeColumnToContents(1)
+        # resizing on every insert is wasteful when adding many levels at once,
+        # so bulk callers pass resize_column=False and resize once at the end
+        if resize_column:
+            self.levelsTable.resizeColumnToContents(1)
 
     def open_namespace_table_menu(self, position):
         menu = QMenu(self)
@@ -846,9 +1147,19 @@ class LoggerTab(QWidget):
         menu.popup(self.table_header_view.viewport().mapToGlobal(position))
 
     def open_header_dialog(self):
-        d = HeaderEditDialog(self.main_window, self.table_header)
-        d.header_changed.connect(self.header_changed)
-        d.setWindowTitle('Header editor')
+        # the dialog is only hidden when closed, so it's built once and refilled after that
+        d = self.header_dialog
+        if d is None:
+            d = HeaderEditDialog(self.main_window, self.table_header)
+            d.header_changed.connect(self.header_changed)
+            d.setWindowTitle('Header editor')
+            self.header_dialog = d
+        elif d.isVisible():
+            d.raise_()
+            d.activateWindow()
+            return
+        else:
+            d.load_from_header()
         d.open()
 
     def header_changed(self, preset_name, set_as_default, columns):
@@ -856,30 +1167,36 @@ class LoggerTab(QWidget):
         if set_as_default:
             CONFIG.set_option('default_header_preset', preset_name)
         CONFIG.save_header_preset(preset_name, columns)
-        self.table_header.replace_columns(columns)
-        self.record_model.modelReset.emit()
+        model = self.record_model
+        if len([c for c in columns if c.visible]) == self.table_header.column_count:
+            # the rows stay the same and so does the number of columns, so the view only has
+            # to re-query the visible cells instead of dropping everything it knows
+            model.layoutAboutToBeChanged.emit()
+            self.table_header.replace_columns(columns)
+            model.layoutChanged.emit()
+            model.headerDataChanged.emit(Qt.Horizontal, 0, self.table_header.column_count - 1)
+        else:
+            self.table_header.replace_columns(columns)
+            model.modelReset.emit()
         self.set_columns_sizes()
         if self.extra_mode:
-            self.loggerTable.resizeRowsToContents()
+            self.resize_rows()
 
     def merge_with_records(self, new_records):
+        self.flush_pending_records()
         self.record_model.merge_with_records(new_records)
-        for record in new_records:
-            if record._cutelog is not None:
-                continue
-            if record.name:
-                self.register_logger(record.name)
-            if record.levelname:
-                level = self.process_level(record.levelname)
-                record.levelname = level.levelname
+        self.register_names_and_levels(new_records)
         if self.autoscroll:
             self.loggerTable.scrollToBottom()
         # # modelReset invalidates the filter already?
         # self.invalidate_filter(resize_rows=False)
         if self.extra_mode or self.word_wrap:
-            self.loggerTable.resizeRowsToContents()
+            self.resize_rows()
 
     def update_detail(self, sel, desel):
+        if self.invalidating:
+            self.detail_outdated = True
+            return
         indexes = sel.indexes()
         if len(indexes) <= 0:
             self.detail_model.clear()
@@ -897,26 +1214,28 @@ class LoggerTab(QWidget):
         show_textview_dialog(self.main_window, title, text)
 
     def enable_all_levels(self):
-        for row in range(self.levelsTable.rowCount()):
-            checkbox = self.levelsTable.cellWidget(row, 0).children()[1]
-            if not checkbox.isChecked():
-                checkbox.setChecked(True)
+        self.set_all_levels_checked(True)
         self.level_show_changed(True)
 
     def disable_all_levels(self):
-        for row in range(self.levelsTable.rowCount()):
-            checkbox = self.levelsTable.cellWidget(row, 0).children()[1]
-            if checkbox.isChecked():
-                checkbox.setChecked(False)
+        self.set_all_levels_checked(False)
         self.level_show_changed(False)
 
+    def set_all_levels_checked(self, checked):
+        # the table is repainted once after all checkboxes are changed instead of once for each
+        self.levelsTable.setUpdatesEnabled(False)
+        for checkbox in self.level_checkboxes:
+            if checkbox.isChecked() != checked:
+                checkbox.setChecked(checked)
+        self.levelsTable.setUpdatesEnabled(True)
+
     def set_dark_theme(self, enabled):
         self.record_model.dark_theme = enabled
 
     def set_extra_mode(self, enabled):
         self.extra_mode = enabled
         self.record_model.extra_mode = enabled
-        self.loggerTable.resizeRowsToContents()
+        self.resize_rows()
         if self.autoscroll:
             self.loggerTable.scrollToBottom()
 
@@ -925,7 +1244,7 @@ class LoggerTab(QWidget):
         self.record_model.word_wrap = enabled
         self.loggerTable.setWordWrap(enabled)
         self.detailTable.setWordWrap(enabled)
-        self.loggerTable.resizeRowsToContents()
+        self.resize_rows()
         if enabled:
             self.loggerTable.setVerticalScrollMode(self.loggerTable.ScrollPerPixel)
             self.detailTable.resizeRowsToContents()
@@ -938,7 +1257,7 @@ class LoggerTab(QWidget):
     def level_double_clicked(self, index):
         row, column = index.row(), index.column()
         if column == 0:  # if you're clicking at the checkbox widget, just toggle it instead
-            checkbox = self.levelsTable.cellWidget(row, column).children()[1]
+            checkbox = self.level_checkboxes[row]
             checkbox.toggle()
             self.level_show_changed(checkbox.isChecked())
         else:
@@ -967,6 +1286,7 @@ class LoggerTab(QWidget):
 
     def level_changed(self, level):
         self.level_filter.set_level(level)
+        self.record_model.clear_style_cache()
         CONFIG.save_levels_preset(self.level_filter.preset_name, self.level_filter.levels)
 
     def levels_changed(self, preset_name, set_as_default, levels):
@@ -974,16 +1294,22 @@ class LoggerTab(QWidget):
         if set_as_default:
             CONFIG.set_option('default_levels_preset', preset_name)
         self.level_filter.merge_with(levels)
+        self.record_model.clear_style_cache()
         self.regen_levels_table(self.level_filter.levels)
         CONFIG.save_levels_preset(preset_name, levels)
         self.invalidate_filter(resize_rows=True)
 
     def regen_levels_table(self, levels):
+        # repaint the table once at the end instead of after every added row
+        self.levelsTable.setUpdatesEnabled(False)
         self.levelsTable.clearContents()
         self.levelsTable.setRowCount(0)
+        self.level_checkboxes.clear()
         for levelname in levels:
             level = levels[levelname]
-            self.add_level_to_table(level)
+            self.add_level_to_table(level, resize_column=False)
+        self.levelsTable.resizeColumnToContents(1)
+        self.levelsTable.setUpdatesEnabled(True)
 
     def tree_selection_changed(self, sel, desel):
         # Problem: when RecordFilter un-hides a row, that row forgets its size.
@@ -1016,8 +1342,9 @@ class LoggerTab(QWidget):
             # selected node is not a descendant of a previously selected
             # node, then resizing is needed
             if self.filter_model.selection_includes_children:
+                prev_paths = set(pnode.path for pnode in prev_sel)
                 for node in cur_sel:
-                    if not any([node.is_descendant_of(pnode.path) for pnode in prev_sel]):
+                    if not node.has_ancestor_in(prev_paths):
                         resize_rows = True
                         break
             # if selection doesn't include children, records can re-appear
@@ -1036,22 +1363,36 @@ class LoggerTab(QWidget):
         self.invalidate_filter(resize_rows=val)
 
     def invalidate_filter(self, resize_rows=True):
+        self.pending_resize_rows = self.pending_resize_rows or resize_rows
+        if not self.invalidate_timer.isActive():
+            self.invalidate_timer.start()
+
+    def apply_filter_invalidation(self):
+        self.invalidate_timer.stop()
+        resize_rows = self.pending_resize_rows
+        self.pending_resize_rows = False
+        # the selection can change several times while rows are being hidden and shown,
+        # so the detail table is only updated once everything has settled
+        self.invalidating = True
         self.filter_model.invalidateFilter()
         # resizeRowsToContents is very slow, so it's best to try to do it only when necessary
         if resize_rows and (self.extra_mode or self.word_wrap):
-            self.loggerTable.resizeRowsToContents()
+            self.resize_rows()
+        self.invalidating = False
+        if self.detail_outdated:
+            self.detail_outdated = False
+            self.update_detail(self.loggerTable.selectionModel().selection(), None)
         if self.autoscroll:
             self.loggerTable.scrollToBottom()
 
     def onScroll(self, pos):
-        if pos < self.scroll_max:
-            self.autoscroll = False
-        else:
-            self.autoscroll = True
+        self.autoscroll = pos >= self.scroll_max
 
     def on_tree_rows_inserted(self, pindex, start, end):
         tree = self.namespaceTreeView
         tmodel = self.namespace_tree_model
+        # the tree is repainted once after all rows are expanded
+        tree.setUpdatesEnabled(False)
         tree.expand(pindex)
         while start <= end:
             index = tmodel.index(start, 0, pindex)
@@ -1060,6 +1401,7 @@ class LoggerTab(QWidget):
             else:
                 tree.expand(index)
             start += 1
+        tree.setUpdatesEnabled(True)
 
     def onRangeChanged(self, min, max):
         self.scroll_max = max
@@ -1071,23 +1413,46 @@ class LoggerTab(QWidget):
             self.main_window.close_popped_out_logger(self)
 
     def add_connection(self, connection):
-        self.log.debug('Adding connection "{}"'.format(connection))
-        self.connections.append(connection)
+        # lazy formatting: the string is only built if debug logging is enabled
+        self.log.debug('Adding connection "%s"', connection)
+        self.connections.add(connection)
 
     def remove_connection(self, connection):
-        self.log.debug('Removing connection "{}"'.format(connection))
-        self.connections.remove(connection)
+        self.log.debug('Removing connection "%s"', connection)
+        self.connections.discard(connection)
         self.add_conn_closed_record(connection)
 
-    def destroy(self):
+    def stop_all_connections(self):
         for conn in self.connections:
             conn.tab_closed = True
-        self.record_model.records.clear()
+
+    def destroy(self):
+        self.stop_all_connections()
+        self.record_batch_timer.stop()
+        self.invalidate_timer.stop()
+        self.table_header.save_pending_changes()
+        self.pending_records.clear()
+        # a proper reset, so the views don't hold on to indexes of rows that are gone
+        self.record_model.beginResetModel()
+        self.record_model.records = deque()
+        self.record_model.endResetModel()
 
     def row_height_changed(self, new_height):
+        # only the latest height matters if several changes arrive in a row,
+        # so they are all applied at once on the next event loop iteration
+        self.pending_row_height = new_height
+        if not self.row_height_update_scheduled:
+            self.row_height_update_scheduled = True
+            QTimer.singleShot(0, self.apply_row_height)
+
+    def apply_row_height(self):
+        self.row_height_update_scheduled = False
+        new_height = self.pending_row_height
         self.log.info("new height = {}".format(new_height))
         self.loggerTable.verticalHeader().setDefaultSectionSize(new_height)
-        self.loggerTable.resizeRowsToContents()
+        # that already resized all rows, only extra mode and word wrap need more than that
+        if self.extra_mode or self.word_wrap:
+            self.resize_rows()
 
     def select_last_row(self):
         row = self.record_model.rowCount()
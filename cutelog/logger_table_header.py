@@ -1,22 +1,39 @@
 import json
-from copy import deepcopy
 from functools import partial
 
-from qtpy.QtCore import QEvent, QObject, Qt, Signal
+from qtpy.QtCore import QEvent, QObject, Qt, QTimer, Signal
 from qtpy.QtWidgets import (QCheckBox, QDialog, QDialogButtonBox, QInputDialog,
                             QLabel, QLineEdit, QListWidget, QListWidgetItem,
                             QMenu, QVBoxLayout)
 
-from .config import CONFIG
+from .config import CONFIG, ORJSON_SUPPORT
 from .utils import show_warning_dialog
 
+if ORJSON_SUPPORT:
+    import orjson
+
+    # orjson produces the same compact output as json with the separators below
+    def dump_json(obj):
+        return orjson.dumps(obj).decode('utf-8')
+    load_json = orjson.loads
+else:
+    def dump_json(obj):
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+    load_json = json.loads
+
 
 class Column:
+    __slots__ = ('name', 'title', 'visible', 'width', 'dumped_key', 'dumped')
+
     def __init__(self, name=None, title=None, visible=True, width=50):
         self.name = name
         self.title = title
         self.visible = visible
         self.width = width
+        # the last dumps() result and what it was made from; presets get saved
+        # much more often than columns change
+        self.dumped_key = None
+        self.dumped = None
 
     def dumps(self, width=None):
         # So QHeaderView sucks. It's hard to make it do what humans expect.
@@ -25,40 +42,64 @@ class Column:
         # value to help with resizing when header.stretchLastSection is True.
         if width is None:
             width = self.width
+        key = (self.name, self.title, width, self.visible)
+        if key == self.dumped_key:
+            return self.dumped
         d = {'name': self.name, 'title': self.title,
              'width': width, 'visible': self.visible}
-        return json.dumps(d, ensure_ascii=False, separators=(',', ':'))
+        self.dumped = dump_json(d)
+        self.dumped_key = key
+        return self.dumped
 
     def loads(self, string):
-        self.__dict__ = json.loads(string)
-        self.width = int(self.width)
+        d = load_json(string)
+        self.name = d['name']
+        self.title = d['title']
+        self.visible = d['visible']
+        self.width = int(d['width'])
         return self
 
+    def copy(self):
+        # much faster than deepcopy, which has to inspect the object to copy it
+        return Column(self.name, self.title, self.visible, self.width)
+
     def __repr__(self):
         return "{}(name={}, title={}, width={})".format(self.__class__.__name__, self.name,
                                                         self.title, self.width)
 
 
+def copy_columns(columns):
+    return [column.copy() for column in columns]
+
+
 # @Future: replace with dict when Python 3.6 becomes the minimum
-DEFAULT_COLUMNS = [
-    Column('asctime', 'Time', width=125),
-    Column('name', 'Name', width=80),
-    Column('levelname', 'Level', width=60),
-    Column('levelno', '#', False, width=22),
-    Column('funcName', 'Function', False, width=80),
-    Column('pathname', 'Path', False, width=120),
-    Column('filename', 'File', False, width=75),
-    Column('lineno', 'Line #', False, width=35),
-    Column('module', 'Module', False, width=50),
-    Column('process', 'Process', False, width=40),
-    Column('processName', 'Process name', False, width=80),
-    Column('thread', 'Thread', False, width=100),
-    Column('threadName', 'Thread name', False, width=70),
-    Column('message', 'Message', True, width=10),
-]
-
-SPECIAL_COLUMNS = {"created", "time", "levelname", "level", "name",
-                   "message", "msg", "exc_text"}
+# (name, title, visible, width); Columns are made from these only when they're needed
+DEFAULT_COLUMN_SPECS = (
+    ('asctime', 'Time', True, 125),
+    ('name', 'Name', True, 80),
+    ('levelname', 'Level', True, 60),
+    ('levelno', '#', False, 22),
+    ('funcName', 'Function', False, 80),
+    ('pathname', 'Path', False, 120),
+    ('filename', 'File', False, 75),
+    ('lineno', 'Line #', False, 35),
+    ('module', 'Module', False, 50),
+    ('process', 'Process', False, 40),
+    ('processName', 'Process name', False, 80),
+    ('thread', 'Thread', False, 100),
+    ('threadName', 'Thread name', False, 70),
+    ('message', 'Message', True, 10),
+)
+
+
+def default_columns():
+    return [Column(*spec) for spec in DEFAULT_COLUMN_SPECS]
+
+
+MESSAGE_COLUMN_NAMES = frozenset({'message', 'msg'})
+
+SPECIAL_COLUMNS = frozenset({"created", "time", "levelname", "level", "name",
+                             "message", "msg", "exc_text"})
 
 
 class LoggerTableHeader(QObject):
@@ -66,10 +107,17 @@ class LoggerTableHeader(QObject):
         super().__init__()
         self.header_view = header_view
         self.preset_name = CONFIG['default_header_preset']
+        # a loaded preset is made of new Columns already, so it doesn't need copying
         columns = CONFIG.load_header_preset(self.preset_name)
         if not columns:
-            columns = DEFAULT_COLUMNS
-        self.columns = deepcopy(columns)
+            columns = default_columns()
+        self.columns = columns
+        self.version = 0  # incremented whenever visible columns change
+        # several resizes in a row are saved only once
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(250)
+        self.save_timer.timeout.connect(self.save_preset)
         self.regen_visible()
 
     def eventFilter(self, object, event):
@@ -88,47 +136,85 @@ class LoggerTableHeader(QObject):
         return False
 
     def mouse_released(self):
+        changed = False
+        last_section = self.header_view.count() - 1
+        stretch_last = self.header_view.stretchLastSection()
         for section in range(self.header_view.count()):
             col = self.visible_columns[section]
-            col.width = self.header_view.sectionSize(section)
+            width = self.header_view.sectionSize(section)
+            if col.width != width:
+                col.width = width
+                # the stretched section changes size with the window, not because of a click
+                if not (stretch_last and section == last_section):
+                    changed = True
+        # most clicks on the header don't resize anything, so there's nothing to save
+        if changed:
+            self.save_timer.start()
+
+    def save_preset(self):
+        self.save_timer.stop()
         CONFIG.save_header_preset(self.preset_name, self.columns)
 
+    def save_pending_changes(self):
+        if self.save_timer.isActive():
+            self.save_preset()
+
     def replace_columns(self, new_columns):
         self.columns = new_columns
         self.regen_visible()
 
     def regen_visible(self):
-        self.visible_columns = [c for c in self.columns if c.visible]
-        self.visible_names = set([c.name for c in self.visible_columns]) | SPECIAL_COLUMNS
-        # print(self.visible_names)
+        self.visible_columns = tuple(c for c in self.columns if c.visible)
+        # the record model looks up the column name for every cell it paints
+        self.visible_names_by_index = tuple(c.name for c in self.visible_columns)
+        self.visible_names = SPECIAL_COLUMNS.union(self.visible_names_by_index)
+        header_view = self.header_view
+        # sectionResized isn't blocked because the table needs it to move its columns,
+        # but the header is only repainted once at the end
+        header_view.setUpdatesEnabled(False)
         for i, column in enumerate(self.visible_columns):
-            self.header_view.resizeSection(i, column.width)
+            # every resize emits sectionResized and relayouts the header, so skip the no-ops
+            if header_view.sectionSize(i) != column.width:
+                header_view.resizeSection(i, column.width)
+        header_view.setUpdatesEnabled(True)
         self.column_count = len(self.visible_columns)
+        self.version += 1
 
     def __getitem__(self, index):
         return self.visible_columns[index]
 
 
 class ColumnListItem(QListWidgetItem):
+    # the view asks for every role of every item on each repaint, so the Qt enums are
+    # looked up once here instead of on every call
+    DisplayRole = Qt.DisplayRole
+    ToolTipRole = Qt.ToolTipRole
+    CheckStateRole = Qt.CheckStateRole
+    Checked = Qt.Checked
+    Unchecked = Qt.Unchecked
+
     def __init__(self, parent, column):
         super().__init__(parent)
         self.column = column
 
     def data(self, role):
-        if role == Qt.DisplayRole:
+        if role == self.DisplayRole:
             return self.column.title
-        elif role == Qt.ToolTipRole:
+        elif role == self.ToolTipRole:
             return self.column.name
-        elif role == Qt.CheckStateRole:
+        elif role == self.CheckStateRole:
             if self.column.visible:
-                return Qt.Checked
+                return self.Checked
             else:
-                return Qt.Unchecked
+                return self.Unchecked
         return None
 
     def setData(self, role, value):
-        if role == Qt.CheckStateRole:
+        if role == self.CheckStateRole:
             self.column.visible = value
+            # the base class stores a copy nobody reads, but it also tells the view
+            # that only this item changed
+            super().setData(role, value)
 
 
 class HeaderEditDialog(QDialog):
@@ -141,9 +227,16 @@ class HeaderEditDialog(QDialog):
 
         self.table_header = table_header
         self.default_preset_name = None
-        self.preset_name = table_header.preset_name
-        self.columns = deepcopy(table_header.columns)
+        self.context_menu = None
+        self.context_menu_presets = None
         self.setupUi()
+        self.load_from_header()
+
+    def load_from_header(self):
+        "Fills the dialog with the current columns, so the same dialog can be opened again"
+        self.preset_name = self.table_header.preset_name
+        self.columns = copy_columns(self.table_header.columns)
+        self.preset_names = None  # presets could've been saved since the last time
         self.update_output()
 
     def setupUi(self):
@@ -189,9 +282,12 @@ class HeaderEditDialog(QDialog):
     def update_output(self):
         self.presetLabel.setText("Preset: {}".format(self.preset_name))
         self.setAsDefaultCheckbox.setChecked(CONFIG['default_header_preset'] == self.preset_name)
+        # the list is repainted once after it's refilled, not for every added item
+        self.columnList.setUpdatesEnabled(False)
         self.columnList.clear()
         for column in self.columns:
             ColumnListItem(self.columnList, column)
+        self.columnList.setUpdatesEnabled(True)
 
     def accept(self):
         self.read_columns_from_list()
@@ -204,32 +300,40 @@ class HeaderEditDialog(QDialog):
         self.done(0)
 
     def reset_to_stock(self):
-        self.columns = deepcopy(DEFAULT_COLUMNS)
+        self.columns = default_columns()
         self.update_output()
 
     def read_columns_from_list(self):
-        new_columns = []
-        for i in range(self.columnList.count()):
-            item = self.columnList.item(i)
-            new_columns.append(item.column)
-        self.columns = new_columns
+        # Depending on the Qt version, a drag and drop in the list is reported either as a move
+        # or as a removal plus an insertion, so the order is read back instead of being tracked
+        item = self.columnList.item
+        self.columns = [item(i).column for i in range(self.columnList.count())]
 
     def toggle_selected_columns(self):
         selected = self.columnList.selectedItems()
         for item in selected:
             value_now = item.data(Qt.CheckStateRole)
             item.setData(Qt.CheckStateRole, not value_now)
-        self.columnList.reset()  # @Improvement: is there a better way to update QListWidget?
 
     def open_menu(self, position):
+        # the menu only changes when presets are added or deleted, so it's rebuilt only then
+        preset_names = self.get_preset_names()
+        if self.context_menu is None or self.context_menu_presets is not preset_names:
+            if self.context_menu is not None:
+                self.context_menu.deleteLater()
+            self.context_menu = self.build_menu(preset_names)
+            self.context_menu_presets = preset_names
+        has_selection = len(self.columnList.selectedIndexes()) > 0
+        self.delete_selected_action.setVisible(has_selection)
+        self.context_menu.popup(self.columnList.viewport().mapToGlobal(position))
+
+    def build_menu(self, preset_names):
         menu = QMenu(self)
 
         preset_menu = menu.addMenu('Presets')
         preset_menu.addAction('New preset', self.new_preset_dialog)
         preset_menu.addSeparator()
 
-        preset_names = CONFIG.get_header_presets()
-
         if len(preset_names) == 0:
             action = preset_menu.addAction('No presets')
             action.setEnabled(False)
@@ -241,11 +345,15 @@ class HeaderEditDialog(QDialog):
 
         menu.addSeparator()
         menu.addAction('New column...', self.create_new_column_dialog)
+        self.delete_selected_action = menu.addAction('Delete selected', self.delete_selected)
+        return menu
 
-        if len(self.columnList.selectedIndexes()) > 0:
-            menu.addAction('Delete selected', self.delete_selected)
-
-        menu.popup(self.columnList.viewport().mapToGlobal(position))
+    def get_preset_names(self):
+        # reading presets means going through QSettings groups, so they're listed once
+        # and listed again only after this dialog adds or deletes one
+        if self.preset_names is None:
+            self.preset_names = CONFIG.get_header_presets()
+        return self.preset_names
 
     def load_preset(self, name):
         new_columns = CONFIG.load_header_preset(name)
@@ -264,7 +372,7 @@ class HeaderEditDialog(QDialog):
         d.open()
 
     def create_new_preset(self, name):
-        if name in CONFIG.get_header_presets():
+        if name in self.get_preset_names():
             show_warning_dialog(self, "Preset creation error",
                                 'Preset named "{}" already exists.'.format(name))
             return
@@ -276,11 +384,13 @@ class HeaderEditDialog(QDialog):
         self.preset_name = name
         self.update_output()
         CONFIG.save_header_preset(name, self.columns)
+        self.preset_names = None
 
     def delete_preset(self, name):
         CONFIG.delete_header_preset(name)
+        self.preset_names = None
         if name == self.preset_name:
-            self.columns = deepcopy(DEFAULT_COLUMNS)
+            self.columns = default_columns()
             self.update_output()
 
     def create_new_column_dialog(self):
@@ -294,7 +404,7 @@ class HeaderEditDialog(QDialog):
         # if the last column is message, insert this column before it (I think that makes sense?)
         if len(self.columns) == 0:
             self.columns.append(new_column)
-        elif self.columns[-1].name in ('message', 'msg'):
+        elif self.columns[-1].name in MESSAGE_COLUMN_NAMES:
             self.columns.insert(-1, new_column)
         else:
             self.columns.append(new_column)
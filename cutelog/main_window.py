@@ -1,10 +1,14 @@
+import json
+import os
 from datetime import datetime
-from qtpy.QtCore import QFile, Qt, QTextStream, QThread, Signal
+from functools import partial
+
+from qtpy.QtCore import QFile, Qt, QThread, Signal
 from qtpy.QtWidgets import (QFileDialog, QInputDialog, QMainWindow, QMenuBar,
                             QStatusBar, QTabWidget, QProgressDialog)
 
 from .about_dialog import AboutDialog
-from .config import CONFIG
+from .config import CONFIG, ORJSON_SUPPORT
 from .listener import LogServer
 from .logger_tab import LoggerTab, LogRecord
 from .merge_dialog import MergeDialog
@@ -27,7 +31,15 @@ class MainWindow(QMainWindow):
         self.single_tab_mode = CONFIG['single_tab_mode_default']
 
         self.loggers_by_name = {}  # name -> LoggerTab
+        self.stylesheets = {}  # resource path -> stylesheet
+        self.name_counters = {}  # base name -> first number that might be free
         self.popped_out_loggers = {}
+        self.current_tab = None  # cached (logger, index) of the current tab
+        self.bulk_update = False  # postpones change_actions_state until a batch is done
+        self.settings_window = None
+        self.load_dialog = None
+        self.save_dialog = None
+        self.save_dialog_logger = None  # whose records the open save dialog is for
 
         self.server_running = False
         self.shutting_down = False
@@ -45,6 +57,9 @@ class MainWindow(QMainWindow):
         self.loggerTabWidget.setTabsClosable(True)
         self.loggerTabWidget.setMovable(True)
         self.loggerTabWidget.setTabBarAutoHide(True)
+        # the cache has to be dropped before anything else reacts to the change
+        self.loggerTabWidget.currentChanged.connect(self.forget_current_tab)
+        self.loggerTabWidget.tabBar().tabMoved.connect(self.forget_current_tab)
         self.loggerTabWidget.currentChanged.connect(self.change_actions_state)
         self.setCentralWidget(self.loggerTabWidget)
 
@@ -112,6 +127,12 @@ class MainWindow(QMainWindow):
         self.menuHelp = self.menubar.addMenu("Help")
         self.actionAbout = self.menuHelp.addAction("About cutelog")
 
+        # if there are no loggers in tabs, these actions will be disabled:
+        self.logger_actions = (self.actionCloseTab, self.actionExtraMode, self.actionPopOut,
+                               self.actionRenameTab, self.actionPopIn, self.actionWordWrap,
+                               self.actionTrimTabRecords, self.actionSetMaxCapacity,
+                               self.actionSaveRecords)
+
         self.change_actions_state()  # to disable all logger actions, since they don't function yet
 
     def setup_action_triggers(self):
@@ -147,35 +168,23 @@ class MainWindow(QMainWindow):
         self.actionAbout.triggered.connect(self.about_dialog)
 
     def change_actions_state(self, index=None):
+        if self.bulk_update:
+            return
         logger, _ = self.current_logger_and_index()
-        # if there are no loggers in tabs, these actions will be disabled:
-        actions = [self.actionCloseTab, self.actionExtraMode, self.actionPopOut,
-                   self.actionRenameTab, self.actionPopIn, self.actionWordWrap,
-                   self.actionTrimTabRecords, self.actionSetMaxCapacity, self.actionSaveRecords]
 
-        if not logger:
-            for action in actions:
-                action.setDisabled(True)
+        no_logger = not logger
+        for action in self.logger_actions:
+            action.setDisabled(no_logger)
+        if no_logger:
             self.actionExtraMode.setChecked(False)
             self.actionWordWrap.setChecked(False)
-            if len(self.popped_out_loggers) > 0:
-                self.actionPopIn.setDisabled(False)
         else:
-            for action in actions:
-                action.setDisabled(False)
-            if len(self.loggers_by_name) == self.loggerTabWidget.count():
-                self.actionPopIn.setDisabled(True)
             self.actionExtraMode.setChecked(logger.extra_mode)
             self.actionWordWrap.setChecked(logger.word_wrap)
 
-        # if all loggers are popped in
-        if len(self.popped_out_loggers) == 0:
-            self.actionPopIn.setDisabled(True)
-
-        if len(self.loggers_by_name) <= 1:
-            self.actionMergeTabs.setDisabled(True)
-        else:
-            self.actionMergeTabs.setDisabled(False)
+        # popping in only depends on whether there is anything to pop in, with or without tabs
+        self.actionPopIn.setDisabled(len(self.popped_out_loggers) == 0)
+        self.actionMergeTabs.setDisabled(len(self.loggers_by_name) <= 1)
 
         self.actionSingleTab.setChecked(self.single_tab_mode or CONFIG['new_conn_clears_tab'])
         if CONFIG['new_conn_clears_tab']:
@@ -204,10 +213,15 @@ class MainWindow(QMainWindow):
             self.resize(geometry.width(), geometry.height())
 
     def settings_dialog(self):
-        d = SettingsDialog(self)
-        d.setWindowModality(Qt.ApplicationModal)
-        d.setAttribute(Qt.WA_DeleteOnClose, True)
-        d.settings_changed.connect(self.settings_changed)
+        # kept around, so its .ui file is only loaded the first time
+        d = self.settings_window
+        if d is None:
+            d = SettingsDialog(self)
+            d.setWindowModality(Qt.ApplicationModal)
+            d.settings_changed.connect(self.settings_changed)
+            self.settings_window = d
+        else:
+            d.load_from_config()
         d.open()
 
     def settings_changed(self, changed):
@@ -228,27 +242,29 @@ class MainWindow(QMainWindow):
         if CONFIG['light_theme_is_native']:
             self.set_style_to_stock()
             return
-        f = QFile(":/light_theme.qss")
-        f.open(QFile.ReadOnly | QFile.Text)
-        ts = QTextStream(f)
-        qss = ts.readAll()
-        # f = open(Config.get_resource_path('light_theme.qss', 'resources/ui'), 'r')
-        # qss = f.read()
-        self.app.setStyleSheet(qss)
+        self.app.setStyleSheet(self.read_stylesheet(":/light_theme.qss"))
 
     def reload_dark_style(self):
-        f = QFile(":/dark_theme.qss")
-        f.open(QFile.ReadOnly | QFile.Text)
-        ts = QTextStream(f)
-        qss = ts.readAll()
-        # f = open(Config.get_resource_path('dark_theme.qss', 'resources/ui'), 'r')
-        # qss = f.read()
-        self.app.setStyleSheet(qss)
+        self.app.setStyleSheet(self.read_stylesheet(":/dark_theme.qss"))
+
+    def read_stylesheet(self, path):
+        # stylesheets are compiled into resources, so they can't change while running
+        qss = self.stylesheets.get(path)
+        if qss is None:
+            f = QFile(path)
+            f.open(QFile.ReadOnly)
+            # the stylesheets are UTF-8 and Qt's parser doesn't care about line endings
+            qss = bytes(f.readAll()).decode('utf-8')
+            f.close()
+            self.stylesheets[path] = qss
+        return qss
 
     def set_style_to_stock(self):
         self.app.setStyleSheet('')
 
     def toggle_dark_theme(self, enabled):
+        if enabled == self.dark_theme:
+            return
         self.dark_theme = enabled
         self.reload_stylesheet()
 
@@ -295,12 +311,13 @@ class MainWindow(QMainWindow):
             self.start_server()
 
     def on_connection(self, conn, conn_id):
-        self.log.debug('New connection id={}'.format(conn_id))
+        self.log.debug('New connection id=%s', conn_id)
 
         if (self.single_tab_mode or CONFIG['new_conn_clears_tab']) and len(self.loggers_by_name) > 0:
             new_logger, _ = self.current_logger_and_index()
             new_logger.add_connection(conn)
             if CONFIG['new_conn_clears_tab']:
+                new_logger.flush_pending_records()
                 new_logger.record_model.trim_except_last_n(0)
         else:
             new_logger, index = self.create_logger(conn)
@@ -313,8 +330,7 @@ class MainWindow(QMainWindow):
             from .listener import BenchmarkMonitor
             bm = BenchmarkMonitor(self, new_logger)
             bm.speed_readout.connect(self.set_status)
-            conn.connection_finished.connect(bm.requestInterruption)
-            self.server.threads.append(bm)
+            conn.connection_finished.connect(bm.stop)
             bm.start()
 
     def create_logger(self, conn, name=None):
@@ -323,18 +339,27 @@ class MainWindow(QMainWindow):
         new_logger.set_dark_theme(self.dark_theme)
         self.loggers_by_name[name] = new_logger
         index = self.loggerTabWidget.addTab(new_logger, name)
+        self.forget_current_tab()
         return new_logger, index
 
     def make_logger_name_unique(self, name):
+        if name not in self.loggers_by_name:
+            return name
+        # numbers below the last one handed out for this name are known to be taken,
+        # unless a logger was removed since then (see forget_taken_names)
         name_f = "{} {{}}".format(name)
-        c = 1
-        while name in self.loggers_by_name:
-            name = name_f.format(c)
+        c = self.name_counters.get(name, 1)
+        while name_f.format(c) in self.loggers_by_name:
             c += 1
-        return name
+        self.name_counters[name] = c + 1
+        return name_f.format(c)
+
+    def forget_taken_names(self):
+        # a name got freed, so numbering has to look for gaps from the start again
+        self.name_counters.clear()
 
     def set_status(self, string, timeout=3000):
-        self.statusBar().showMessage(string, timeout)
+        self.statusbar.showMessage(string, timeout)
 
     def rename_tab_dialog(self):
         logger, index = self.current_logger_and_index()
@@ -344,21 +369,25 @@ class MainWindow(QMainWindow):
         d = QInputDialog(self)
         d.setLabelText('Enter the new name for the "{}" tab:'.format(logger.name))
         d.setWindowTitle('Rename the "{}" tab'.format(logger.name))
-        d.textValueSelected.connect(self.rename_current_tab)
+        # bound to this logger, since a new connection can switch tabs while the dialog is open
+        d.textValueSelected.connect(partial(self.rename_tab, logger))
         d.open()
 
-    def rename_current_tab(self, new_name):
-        logger, index = self.current_logger_and_index()
+    def rename_tab(self, logger, new_name):
         if new_name in self.loggers_by_name and new_name != logger.name:
             show_warning_dialog(self, "Rename error",
                                 'Logger named "{}" already exists.'.format(new_name))
             return
-        self.log.debug('Renaming logger "{}" to "{}"'.format(logger.name, new_name))
+        self.log.debug('Renaming logger "%s" to "%s"', logger.name, new_name)
         del self.loggers_by_name[logger.name]
+        self.forget_taken_names()
         logger.name = new_name
         self.loggers_by_name[new_name] = logger
-        logger.log.name = '.'.join(logger.log.name.split('.')[:-1]) + '.{}'.format(new_name)
-        self.loggerTabWidget.setTabText(index, new_name)
+        # every tab's log is a child of this window's log (see create_logger)
+        logger.log.name = '{}.{}'.format(self.log.name, new_name)
+        index = self.loggerTabWidget.indexOf(logger)
+        if index != -1:
+            self.loggerTabWidget.setTabText(index, new_name)
 
     def trim_records_dialog(self):
         logger, index = self.current_logger_and_index()
@@ -370,11 +399,10 @@ class MainWindow(QMainWindow):
         d.setIntRange(0, 100000000)  # because it sets intMaximum to 99 by default. why??
         d.setLabelText('Keep this many records out of {}:'.format(logger.record_model.rowCount()))
         d.setWindowTitle('Trim tab records of "{}" logger'.format(logger.name))
-        d.intValueSelected.connect(self.trim_current_tab_records)
+        d.intValueSelected.connect(partial(self.trim_tab_records, logger))
         d.open()
 
-    def trim_current_tab_records(self, n):
-        logger, index = self.current_logger_and_index()
+    def trim_tab_records(self, logger, n):
         logger.record_model.trim_except_last_n(n)
 
     def max_capacity_dialog(self):
@@ -390,27 +418,29 @@ class MainWindow(QMainWindow):
         label_str = 'Set max capacity for "{}" logger\nCurrently {}. Set to 0 to disable:'
         d.setLabelText(label_str.format(logger.name, max_now))
         d.setWindowTitle('Set max capacity')
-        d.intValueSelected.connect(self.set_max_capacity)
+        d.intValueSelected.connect(partial(self.set_max_capacity, logger))
         d.open()
 
-    def set_max_capacity(self, n):
-        logger, index = self.current_logger_and_index()
+    def set_max_capacity(self, logger, n):
         logger.set_max_capacity(n)
 
     def merge_tabs_dialog(self):
-        d = MergeDialog(self, self.loggers_by_name)
+        d = MergeDialog(self, dict(self.loggers_by_name))
         d.setWindowModality(Qt.WindowModal)
         d.merge_tabs_signal.connect(self.merge_tabs)
         d.show()
 
     def merge_tabs(self, dst, srcs, keep_alive):
-        self.log.debug('Merging tabs: dst="{}", srcs={}, keep={}'.format(dst, srcs, keep_alive))
+        self.log.debug('Merging tabs: dst="%s", srcs=%s, keep=%s', dst, srcs, keep_alive)
 
         dst_logger = self.loggers_by_name[dst]
-        for src_name in srcs:
-            src_logger = self.loggers_by_name[src_name]
-
-            dst_logger.merge_with_records(src_logger.record_model.records)
+        src_loggers = [self.loggers_by_name[src_name] for src_name in srcs]
+        # records of all sources are merged in one go, so the destination model
+        # is reset and its rows are resized only once
+        merged_records = []
+        for src_logger in src_loggers:
+            src_logger.flush_pending_records()
+            merged_records.extend(src_logger.record_model.records)
 
             if keep_alive:
                 for conn in src_logger.connections:
@@ -420,7 +450,15 @@ class MainWindow(QMainWindow):
                     conn.new_record.connect(dst_logger.on_record)
                     dst_logger.add_connection(conn)
                 src_logger.connections.clear()
-            self.destroy_logger(src_logger)
+        dst_logger.merge_with_records(merged_records)
+
+        self.bulk_update = True
+        try:
+            for src_logger in src_loggers:
+                self.destroy_logger(src_logger)
+        finally:
+            self.bulk_update = False
+        self.change_actions_state()
 
     def close_current_tab(self):
         _, index = self.current_logger_and_index()
@@ -429,38 +467,57 @@ class MainWindow(QMainWindow):
         self.close_tab(index)
 
     def close_tab(self, index):
-        self.log.debug("Tab close requested: {}".format(index))
+        self.log.debug("Tab close requested: %s", index)
         logger = self.loggerTabWidget.widget(index)
         self.loggerTabWidget.removeTab(index)
+        self.forget_current_tab()
         self.log.debug(logger.name)
         self.destroy_logger(logger)
 
     def destroy_logger(self, logger):
         del self.loggers_by_name[logger.name]
-        logger.setParent(None)
+        # merging can destroy a popped out logger too
+        self.popped_out_loggers.pop(logger.name, None)
+        self.forget_taken_names()
+        self.forget_current_tab()
+        self.free_logger(logger)
+
+    def free_logger(self, logger):
         logger.destroy()
-        del logger
+        logger.setParent(None)
+        # Qt frees the widget once the signals already queued for it are delivered
+        logger.deleteLater()
 
     def close_popped_out_logger(self, logger):
+        # this can run twice for one logger: on the close event and again when the window's
+        # destroyed signal calls closeEvent, so the second call has to be a no-op
+        if self.popped_out_loggers.pop(logger.name, None) is None:
+            return
         del self.loggers_by_name[logger.name]
-        del self.popped_out_loggers[logger.name]
-        del logger
-        if len(self.popped_out_loggers):
-            self.actionPopIn.setDisabled(True)
+        self.forget_taken_names()
+        # the window itself is deleted on close (WA_DeleteOnClose), but not its records
+        logger.destroy()
+        self.change_actions_state()
 
     def current_logger_and_index(self):
+        if self.current_tab is not None:
+            return self.current_tab
         index = self.loggerTabWidget.currentIndex()
         if index == -1:
             return None, None
 
         logger = self.loggerTabWidget.widget(index)
-        return logger, index
+        self.current_tab = (logger, index)
+        return self.current_tab
+
+    def forget_current_tab(self, *args):
+        self.current_tab = None
 
     def pop_out_tab(self):
         logger, index = self.current_logger_and_index()
         if not logger:
             return
-        self.log.debug("Tab pop out requested: {}".format(int(index)))
+        self.log.debug("Tab pop out requested: %d", index)
 
         logger.destroyed.connect(logger.closeEvent)
         logger.setAttribute(Qt.WA_DeleteOnClose, True)
@@ -468,21 +525,27 @@ class MainWindow(QMainWindow):
         logger.setWindowTitle('cutelog: "{}"'.format(self.loggerTabWidget.tabText(index)))
         self.popped_out_loggers[logger.name] = logger
         self.loggerTabWidget.removeTab(index)
+        self.forget_current_tab()
         logger.popped_out = True
         logger.show()
         center_widget_on_screen(logger)
 
     def pop_in_tabs_dialog(self):
-        d = PopInDialog(self, self.loggers_by_name.values())
+        d = PopInDialog(self, tuple(self.popped_out_loggers.values()))
         d.pop_in_tabs.connect(self.pop_in_tabs)
         d.setWindowModality(Qt.ApplicationModal)
         d.open()
 
     def pop_in_tabs(self, names):
-        for name in names:
-            self.log.debug('Popping in logger "{}"'.format(name))
-            logger = self.loggers_by_name[name]
-            self.pop_in_tab(logger)
+        self.bulk_update = True
+        try:
+            for name in names:
+                self.log.debug('Popping in logger "%s"', name)
+                logger = self.loggers_by_name[name]
+                self.pop_in_tab(logger)
+        finally:
+            self.bulk_update = False
+        self.change_actions_state()
 
     def pop_in_tab(self, logger):
         logger.setWindowFlags(Qt.Widget)
@@ -492,17 +555,20 @@ class MainWindow(QMainWindow):
         logger.popped_out = False
         del self.popped_out_loggers[logger.name]
         index = self.loggerTabWidget.addTab(logger, logger.windowTitle())
+        self.forget_current_tab()
         self.loggerTabWidget.setCurrentIndex(index)
 
     def open_load_records_dialog(self):
-        d = QFileDialog(self)
-        d.setFileMode(QFileDialog.ExistingFile)
-        d.fileSelected.connect(self.load_records)
-        d.setWindowTitle('Load records from...')
-        d.open()
+        # the dialogs are kept around, since creating them can be slow on some platforms
+        if self.load_dialog is None:
+            d = QFileDialog(self)
+            d.setFileMode(QFileDialog.ExistingFile)
+            d.fileSelected.connect(self.load_records)
+            d.setWindowTitle('Load records from...')
+            self.load_dialog = d
+        self.load_dialog.open()
 
     def load_records(self, load_path):
-        from functools import partial
         progress = QProgressDialog('Loading records...', 'Cancel', 0, 0, parent=self)
         progress.setAutoClose(True)
         progress.forceShow()
@@ -533,23 +599,30 @@ class MainWindow(QMainWindow):
             show_critical_dialog(self, "Couldn't load records", text)
 
     def open_save_records_dialog(self):
-        from functools import partial
         logger, _ = self.current_logger_and_index()
         if not logger:
             return
 
-        d = QFileDialog(self)
+        d = self.save_dialog
+        if d is None:
+            d = QFileDialog(self)
+            d.setAcceptMode(QFileDialog.AcceptSave)
+            d.setFileMode(QFileDialog.AnyFile)
+            d.fileSelected.connect(self.save_dialog_file_selected)
+            self.save_dialog = d
         dt = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         d.selectFile("{}_{}.log".format(logger.name, dt))
-        d.setAcceptMode(QFileDialog.AcceptSave)
-        d.setFileMode(QFileDialog.AnyFile)
-        d.fileSelected.connect(partial(self.save_records, logger))
         d.setWindowTitle('Save records of "{}" tab to...'.format(logger.name))
+        self.save_dialog_logger = logger
         d.open()
 
-    def save_records(self, logger, path):
-        import json
+    def save_dialog_file_selected(self, path):
+        logger = self.save_dialog_logger
+        self.save_dialog_logger = None
+        if logger is not None:
+            self.save_records(logger, path)
 
+    def save_records(self, logger, path):
         # needed because a deque is not serializable
         class RecordList(list):
             def __init__(self, records):
@@ -562,14 +635,34 @@ class MainWindow(QMainWindow):
                 for record in self.records:
                     d = record._logDict
                     if not d.get('created', False) and not d.get('time', False):
-                        d['_created'] = record.created
+                        # a copy, so that the record itself doesn't get an extra field
+                        d = dict(d, _created=record.created)
                     yield d
 
         try:
+            logger.flush_pending_records()
             records = logger.record_model.records
             record_list = RecordList(records)
-            with open(path, 'w') as f:
-                json.dump(record_list, f, indent=1)
+            if path.endswith('.jsonl'):
+                self.save_records_as_lines(record_list, path)
+                self.set_status('Records have been saved to "{}"'.format(path))
+                return
+            data = None
+            if ORJSON_SUPPORT:
+                import orjson
+                try:
+                    # much faster than json, but builds the whole file in memory first
+                    data = orjson.dumps(list(record_list), option=orjson.OPT_INDENT_2)
+                except TypeError:  # e.g. non-string keys, which json can handle
+                    self.log.debug('orjson failed to encode records', exc_info=True)
+            if data is not None:
+                with open(path, 'wb') as f:
+                    f.write(data)
+            else:
+                # json.dump encodes the list lazily, one record at a time, so the whole file
+                # is never built in memory
+                with open(path, 'w') as f:
+                    json.dump(record_list, f, indent=1)
             self.set_status('Records have been saved to "{}"'.format(path))
 
         except Exception as e:
@@ -577,6 +670,24 @@ class MainWindow(QMainWindow):
             self.log.error(text, exc_info=True)
             show_critical_dialog(self, "Couldn't save records", text)
 
+    def save_records_as_lines(self, record_list, path):
+        # one compact record per line, written as it's encoded, so memory use
+        # doesn't grow with the number of records
+        if ORJSON_SUPPORT:
+            import orjson
+            with open(path, 'wb') as f:
+                for d in record_list:
+                    try:
+                        f.write(orjson.dumps(d))
+                    except TypeError:  # e.g. non-string keys, which json can handle
+                        f.write(json.dumps(d, separators=(',', ':')).encode())
+                    f.write(b'\n')
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                for d in record_list:
+                    f.write(json.dumps(d, separators=(',', ':')))
+                    f.write('\n')
+
     def closeEvent(self, event):
         self.log.info('Close event on main window')
         self.shutdown()
@@ -584,9 +695,16 @@ class MainWindow(QMainWindow):
 
     def destroy_all_tabs(self):
         self.log.debug('Destroying tabs')
-        delete_this = list(self.loggers_by_name.values())  # to prevent changing during iteration
+        delete_this = tuple(self.loggers_by_name.values())
+        # everything goes at once, so the bookkeeping is cleared once instead of per logger
+        self.loggers_by_name.clear()
+        self.popped_out_loggers.clear()
+        self.forget_taken_names()
+        self.forget_current_tab()
+        # the window is going away, so the actions don't need to follow the tabs anymore
+        self.bulk_update = True
         for logger in delete_this:
-            self.destroy_logger(logger)
+            self.free_logger(logger)
 
     def stop_benchmark(self):
         if self.server:
@@ -617,13 +735,13 @@ class LoadingThread(QThread):
         self.log = log.getChild('LT')
 
     def run(self):
-        from os import path
         self.log.debug('Starting loading thread')
         records = []
 
         try:
-            name = path.basename(self.load_path)
-            file = open(self.load_path, 'r')
+            name = os.path.basename(self.load_path)
+            # records are always saved as UTF-8, whatever the locale's encoding is
+            file = open(self.load_path, 'r', encoding='utf-8')
         except Exception as e:
             text = "Error while opening the file: \n{}".format(e)
             self.log.error(text, exc_info=True)
@@ -636,6 +754,8 @@ class LoadingThread(QThread):
             self.log.error(text, exc_info=True)
             self.loading_error.emit(text)
             return
+        finally:
+            file.close()
         self.log.debug('Loading finished')
         if not self.isInterruptionRequested():
             self.done_loading.emit((name, records))
@@ -643,20 +763,25 @@ class LoadingThread(QThread):
             self.log.warning("Loading was interrupted")
 
     def load(self, file):
+        if self.load_path.endswith('.jsonl'):
+            return self.load_lines(file)
         try:
-            # Standard json module is the fastest when it comes to loading a single large object,
+            # Loading a single large object natively (with orjson if it's installed) is the fastest,
             # and if it's not a valid JSON object it'll fail quickly and fall back to jsonstream
             return self.load_native(file)
         except Exception as e:
-            self.log.debug("Error while loading natively: {}".format(e), exc_info=True)
+            self.log.debug("Error while loading natively: %s", e, exc_info=True)
         file.seek(0)
         return self.load_stream(file)
 
     def load_native(self, file):
         self.log.debug("Attempting to load natively")
-        import json
         records = []
-        rec_dicts = json.load(file)
+        if ORJSON_SUPPORT:
+            import orjson
+            rec_dicts = orjson.loads(file.read())
+        else:
+            rec_dicts = json.load(file)
         for i, rec_dict in enumerate(rec_dicts):
             records.append(LogRecord(rec_dict))
             if i % 10000 == 0:
@@ -666,6 +791,23 @@ class LoadingThread(QThread):
             raise Exception("No records found")
         return records
 
+    def load_lines(self, file):
+        self.log.debug("Attempting to load line by line")
+        if ORJSON_SUPPORT:
+            import orjson
+            loads = orjson.loads
+        else:
+            loads = json.loads
+        records = []
+        for i, line in enumerate(file):
+            if line.isspace():
+                continue
+            records.append(LogRecord(loads(line)))
+            if i % 10000 == 0:
+                if self.isInterruptionRequested():
+                    break
+        return records
+
     def load_stream(self, file):
         import jsonstream
         self.log.debug("Attempting to load with jsonstream")
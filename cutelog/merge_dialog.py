@@ -1,19 +1,10 @@
 # from qtpy.uic import loadUi
+from collections import OrderedDict
+
 from qtpy.QtCore import Qt, Signal
 from qtpy.QtWidgets import (QAbstractItemView, QCheckBox, QComboBox, QDialog,
                             QDialogButtonBox, QGridLayout, QLabel, QListWidget,
-                            QListWidgetItem, QSizePolicy, QSpacerItem)
-
-
-class LoggerListItem(QListWidgetItem):
-    def __init__(self, parent, name):
-        super().__init__(parent)
-        self.name = name
-
-    def data(self, role):
-        if role == Qt.DisplayRole:
-            return self.name
-        return None
+                            QSizePolicy, QSpacerItem)
 
 
 class MergeDialog(QDialog):
@@ -25,7 +16,8 @@ class MergeDialog(QDialog):
         super().__init__(parent)
 
         self.loggers = loggers
-        self.merge_list = []   # all tabs to be merged
+        # names of all tabs to be merged, in combo box order (plain dicts are unordered on 3.5)
+        self.merge_list = OrderedDict()
         self.merge_dst = None  # tab to merge the rest of merge_list into
 
         self.setupUi()
@@ -64,32 +56,43 @@ class MergeDialog(QDialog):
         self.fill_logger_list()
 
     def fill_logger_list(self):
-        for logger_name in self.loggers.keys():
-            LoggerListItem(self.loggerList, logger_name)
+        self.loggerList.addItems(list(self.loggers.keys()))
 
     def merge_list_changed(self, sel, desel):
-        sel = sel.indexes()
-        desel = desel.indexes()
-        for index in sel:
-            sel_item = self.loggerList.itemFromIndex(index)
-            self.merge_list.append(sel_item)
-            self.dstComboBox.addItem(sel_item.name)
-            self.ok_button.setEnabled(True)
-
-        for index in desel:
-            desel_item = self.loggerList.itemFromIndex(index)
-            self.merge_list.remove(desel_item)
-            row = self.dstComboBox.findText(desel_item.name)
-            self.dstComboBox.removeItem(row)
-            if self.dstComboBox.count() == 0:
-                self.ok_button.setEnabled(False)
+        item_from_index = self.loggerList.itemFromIndex
+        added = []
+        for index in sel.indexes():
+            name = item_from_index(index).text()
+            self.merge_list[name] = None
+            added.append(name)
+
+        removed = False
+        for index in desel.indexes():
+            del self.merge_list[item_from_index(index).text()]
+            removed = True
+
+        combo = self.dstComboBox
+        if removed:
+            # refilling the box once is cheaper than looking up every removed name in it
+            dst = self.merge_dst
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItems(list(self.merge_list))
+            if dst in self.merge_list:
+                combo.setCurrentText(dst)
+            combo.blockSignals(False)
+            self.merge_dst = combo.currentText()
+        elif added:
+            combo.addItems(added)
+        self.ok_button.setEnabled(len(self.merge_list) > 0)
 
     def merge_dst_changed(self, text):
         self.merge_dst = text
 
     def accept(self):
-        name_list = [item.name for item in self.merge_list]
-        name_list.remove(self.merge_dst)
+        # the dialog is closed right after, so merge_list can be consumed here
+        del self.merge_list[self.merge_dst]
+        name_list = list(self.merge_list)
         self.merge_tabs_signal.emit(self.merge_dst, name_list, self.keepAliveCheckBox.isChecked())
         self.done(0)
 
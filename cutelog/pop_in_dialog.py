@@ -28,9 +28,7 @@ class PopInDialog(QDialog):
         self.fill_logger_list()
 
     def fill_logger_list(self):
-        for logger in self.loggers:
-            if logger.popped_out:
-                self.listWidget.addItem(logger.name)
+        self.listWidget.addItems([logger.name for logger in self.loggers if logger.popped_out])
         self.listWidget.setCurrentRow(0)
 
     def accept(self, index=None):
@@ -25,11 +25,19 @@ class SettingsDialog(QDialog):
         self.restoreDefaultsButton = self.buttonBox.button(QDialogButtonBox.RestoreDefaults)
         self.restoreDefaultsButton.clicked.connect(self.confirm_restore_defaults)
 
-        self.listenHostLine.textChanged.connect(self.server_options_changed)
-        self.listenPortLine.textChanged.connect(self.server_options_changed)
-
         self.setup_tooltips()
 
+        # the dialog is reused, so anything that doesn't come from the config is set up once
+        self.timeFormatLine.setValidator(self.time_format_validator)
+        self.timeFormatLine.textChanged.connect(self.time_format_valid)
+        self.listenPortLine.setValidator(QIntValidator(0, 65535, self))
+        if MSGPACK_SUPPORT:
+            self.serializationFormatCombo.addItem("msgpack")
+        if CBOR_SUPPORT:
+            self.serializationFormatCombo.addItem("cbor")
+        self.logLevelLine.setValidator(QIntValidator(0, 1000, self))
+        self.benchmarkIntervalLine.setValidator(QDoubleValidator(0, 1000, 9, self))
+
         self.load_from_config()
 
     def setup_tooltips(self):
@@ -54,8 +62,6 @@ class SettingsDialog(QDialog):
         self.wordWrapCheckBox.setChecked(CONFIG['word_wrap_default'])
         self.excIndicationComboBox.setCurrentIndex(CONFIG['exception_indication'])
         self.timeFormatLine.setText(CONFIG['time_format_string'])
-        self.timeFormatLine.setValidator(self.time_format_validator)
-        self.timeFormatLine.textChanged.connect(self.time_format_valid)
 
         # Search
         self.searchOpenDefaultCheckBox.setChecked(CONFIG['search_open_default'])
@@ -65,64 +71,68 @@ class SettingsDialog(QDialog):
 
         # Server page
         self.listenHostLine.setText(CONFIG['listen_host'])
-        self.listenPortLine.setValidator(QIntValidator(0, 65535, self))
         self.listenPortLine.setText(str(CONFIG['listen_port']))
         self.singleTabCheckBox.setChecked(CONFIG['single_tab_mode_default'])
         self.newConnClearsTabCheckBox.setChecked(CONFIG['new_conn_clears_tab'])
         self.extraModeCheckBox.setChecked(CONFIG['extra_mode_default'])
         self.useSystemProxyCheckBox.setChecked(CONFIG['use_system_proxy'])
-        if MSGPACK_SUPPORT:
-            self.serializationFormatCombo.addItem("msgpack")
-        if CBOR_SUPPORT:
-            self.serializationFormatCombo.addItem("cbor")
         i = self.serializationFormatCombo.findText(CONFIG['default_serialization_format'])
         if i != -1:
             self.serializationFormatCombo.setCurrentIndex(i)
 
         # Advanced page
-        self.logLevelLine.setValidator(QIntValidator(0, 1000, self))
         self.logLevelLine.setText(str(CONFIG['console_logging_level']))
         self.benchmarkCheckBox.setChecked(CONFIG['benchmark'])
-        self.benchmarkIntervalLine.setValidator(QDoubleValidator(0, 1000, 9, self))
         self.benchmarkIntervalLine.setText(str(CONFIG['benchmark_interval']))
         self.lightThemeNativeCheckBox.setChecked(CONFIG['light_theme_is_native'])
         self.server_restart_needed = False
 
     def save_to_config(self):
+        # only the options that actually changed are passed on and saved
         o = {}
+        options = CONFIG.options
+
+        def set_option(name, value):
+            if options.get(name) != value:
+                o[name] = value
+
         # Appearance
-        o['dark_theme_default'] = self.darkThemeDefaultCheckBox.isChecked()
-        o['logger_table_font'] = self.loggerTableFont.currentFont().family()
-        o['logger_table_font_size'] = self.loggerTableFontSize.value()
-        o['text_view_dialog_font'] = self.textViewFont.currentFont().family()
-        o['text_view_dialog_font_size'] = self.textViewFontSize.value()
-        o['exception_indication'] = self.excIndicationComboBox.currentIndex()
-        o['logger_row_height'] = self.loggerTableRowHeight.value()
-        o['word_wrap_default'] = self.wordWrapCheckBox.isChecked()
+        set_option('dark_theme_default', self.darkThemeDefaultCheckBox.isChecked())
+        set_option('logger_table_font', self.loggerTableFont.currentFont().family())
+        set_option('logger_table_font_size', self.loggerTableFontSize.value())
+        set_option('text_view_dialog_font', self.textViewFont.currentFont().family())
+        set_option('text_view_dialog_font_size', self.textViewFontSize.value())
+        set_option('exception_indication', self.excIndicationComboBox.currentIndex())
+        set_option('logger_row_height', self.loggerTableRowHeight.value())
+        set_option('word_wrap_default', self.wordWrapCheckBox.isChecked())
         if self.timeFormatLine.hasAcceptableInput():
-            o['time_format_string'] = self.timeFormatLine.text()
+            set_option('time_format_string', self.timeFormatLine.text())
 
         # Search
-        o['search_open_default'] = self.searchOpenDefaultCheckBox.isChecked()
-        o['search_regex_default'] = self.searchRegexDefaultCheckBox.isChecked()
-        o['search_casesensitive_default'] = self.searchCaseSensitiveDefaultCheckBox.isChecked()
-        o['search_wildcard_default'] = self.searchWildcardDefaultCheckBox.isChecked()
+        set_option('search_open_default', self.searchOpenDefaultCheckBox.isChecked())
+        set_option('search_regex_default', self.searchRegexDefaultCheckBox.isChecked())
+        set_option('search_casesensitive_default',
+                   self.searchCaseSensitiveDefaultCheckBox.isChecked())
+        set_option('search_wildcard_default', self.searchWildcardDefaultCheckBox.isChecked())
 
         # Server
-        o['listen_host'] = self.listenHostLine.text()
-        o['listen_port'] = int(self.listenPortLine.text())
-        o['console_logging_level'] = int(self.logLevelLine.text())
-        o['single_tab_mode_default'] = self.singleTabCheckBox.isChecked()
-        o['new_conn_clears_tab'] = self.newConnClearsTabCheckBox.isChecked()
-        o['extra_mode_default'] = self.extraModeCheckBox.isChecked()
-        o['default_serialization_format'] = self.serializationFormatCombo.currentText()
-        o['use_system_proxy'] = self.useSystemProxyCheckBox.isChecked()
+        set_option('listen_host', self.listenHostLine.text())
+        set_option('listen_port', int(self.listenPortLine.text()))
+        set_option('console_logging_level', int(self.logLevelLine.text()))
+        set_option('single_tab_mode_default', self.singleTabCheckBox.isChecked())
+        set_option('new_conn_clears_tab', self.newConnClearsTabCheckBox.isChecked())
+        set_option('extra_mode_default', self.extraModeCheckBox.isChecked())
+        set_option('default_serialization_format', self.serializationFormatCombo.currentText())
+        set_option('use_system_proxy', self.useSystemProxyCheckBox.isChecked())
 
         # Advanced
-        o['benchmark_interval'] = float(self.benchmarkIntervalLine.text())
-        o['benchmark'] = self.benchmarkCheckBox.isChecked()
-        o['light_theme_is_native'] = self.lightThemeNativeCheckBox.isChecked()
-        CONFIG.update_options(o)
+        set_option('benchmark_interval', float(self.benchmarkIntervalLine.text()))
+        set_option('benchmark', self.benchmarkCheckBox.isChecked())
+        set_option('light_theme_is_native', self.lightThemeNativeCheckBox.isChecked())
+        if 'listen_host' in o or 'listen_port' in o:
+            self.server_restart_needed = True
+        if o:
+            CONFIG.update_options(o)
 
     def accept(self):
         self.save_to_config()
@@ -135,9 +145,6 @@ class SettingsDialog(QDialog):
     def reject(self):
         self.done(0)
 
-    def server_options_changed(self):
-        self.server_restart_needed = True
-
     def display_warning(self):
         m = QMessageBox(self.parent())
         m.setText('You need to restart the server for the changes to take effect')
@@ -169,12 +176,20 @@ class SettingsDialog(QDialog):
 
 
 class TimeFormatValidator(QValidator):
+    # any date works for checking the format, so there's no need to ask for the time
+    probe_date = datetime(2000, 1, 1)
+
     def __init__(self, parent):
         super().__init__(parent)
+        self.last_acceptable = None
 
     def validate(self, fmt_string, pos):
-        try:
-            datetime.now().strftime(fmt_string)
+        # Qt validates the same text again on focus changes and hasAcceptableInput()
+        if fmt_string == self.last_acceptable:
             return self.Acceptable, fmt_string, pos
+        try:
+            self.probe_date.strftime(fmt_string)
         except Exception:
             return self.Intermediate, fmt_string, pos
+        self.last_acceptable = fmt_string
+        return self.Acceptable, fmt_string, pos
@@ -5,6 +5,9 @@ from qtpy.QtWidgets import (QApplication, QDialog, QHBoxLayout, QLayout,
 
 from .config import CONFIG
 
+# (family, size) -> QFont, so the font isn't resolved again every time a dialog is opened
+FONTS = {}
+
 
 class TextViewDialog(QDialog):
     def __init__(self, parent, text):
@@ -29,15 +32,28 @@ class TextViewDialog(QDialog):
         self.verticalLayout.addLayout(self.horizontalLayout)
         self.closeButton.clicked.connect(self.reject)
 
-        font = QFont(CONFIG['text_view_dialog_font'], CONFIG['text_view_dialog_font_size'])
-        font.setStyleHint(QFont.Monospace)
-        self.textEdit.setFont(font)
+        self.textEdit.setFont(self.get_font())
 
         self.closeButton.setText('Close')
         self.copyButton.setText('Copy to clipboard')
         self.textEdit.setPlainText(self.text)
         self.copyButton.clicked.connect(self.copy_text)
 
+    @staticmethod
+    def get_font():
+        # keyed by the settings themselves, so changing them in the settings just adds a new entry
+        key = (CONFIG['text_view_dialog_font'], CONFIG['text_view_dialog_font_size'])
+        font = FONTS.get(key)
+        if font is None:
+            font = QFont(*key)
+            font.setStyleHint(QFont.Monospace)
+            FONTS[key] = font
+        return font
+
     def copy_text(self):
         clipboard = QApplication.clipboard()
-        clipboard.setText(self.textEdit.toPlainText())
+        # the text is only read back from the document if it was edited in the dialog
+        if self.textEdit.document().isModified():
+            clipboard.setText(self.textEdit.toPlainText())
+        else:
+            clipboard.setText(self.text)
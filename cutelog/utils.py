@@ -1,6 +1,6 @@
 import qtpy
 from qtpy.QtCore import QMetaObject, Qt
-from qtpy.QtWidgets import QDesktopWidget, QMessageBox
+from qtpy.QtWidgets import QApplication, QMessageBox
 from .text_view_dialog import TextViewDialog
 
 
@@ -37,7 +37,8 @@ def show_textview_dialog(parent, title, text, icon=QMessageBox.Information):
 
 def center_widget_on_screen(widget):
     rect = widget.frameGeometry()
-    center = QDesktopWidget().availableGeometry().center()
+    # the application's own desktop widget, instead of creating a new one every time
+    center = QApplication.desktop().availableGeometry().center()
     rect.moveCenter(center)
     widget.move(rect.topLeft())
 
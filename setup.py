@@ -9,26 +9,52 @@ from setuptools.command.install import install
 VERSION = '2.2.0'
 
 
+def resources_up_to_date(qrc_path, py_path):
+    # resources.py only needs rebuilding if the .qrc or any file listed in it is newer
+    import os
+    from xml.etree import ElementTree
+
+    try:
+        built = os.path.getmtime(py_path)
+    except OSError:
+        return False
+    qrc_dir = dirname(qrc_path)
+    sources = [qrc_path]
+    sources.extend(join(qrc_dir, f.text) for f in ElementTree.parse(qrc_path).iter('file'))
+    try:
+        return all(os.path.getmtime(source) <= built for source in sources)
+    except OSError:
+        return False
+
+
 def build_qt_resources():
+    qrc_path = 'cutelog/resources/resources.qrc'
+    py_path = 'cutelog/resources.py'
+    if resources_up_to_date(qrc_path, py_path):
+        print('Resources are up to date')
+        return
     print('Compiling resources...')
     try:
         from PyQt5 import pyrcc_main
     except ImportError as e:
         raise Exception("Building from source requires PyQt5") from e
-    pyrcc_main.processResourceFile(['cutelog/resources/resources.qrc'],
-                                   'cutelog/resources.py', False)
+    pyrcc_main.processResourceFile([qrc_path], py_path, False)
     # Rewrite PyQt5 import statements to qtpy
-    with open('cutelog/resources.py', 'r') as rf:
-        lines = rf.readlines()
-        for i, line in enumerate(lines):
-            if 'import' in line and not line.startswith('\\x'):
-                new_line = line.replace('PyQt5', 'qtpy')
-                lines[i] = new_line
-    with open('cutelog/resources.py', 'w') as wf:
-        wf.writelines(lines)
+    # (the resource data is all \x escapes, so it can't contain these)
+    with open(py_path, 'r') as rf:
+        data = rf.read()
+    data = data.replace('from PyQt5', 'from qtpy').replace('import PyQt5', 'import qtpy')
+    with open(py_path, 'w') as wf:
+        wf.write(data)
     print('Resources compiled successfully')
 
 
+def read_readme():
+    # explicit encoding, so the build doesn't depend on the locale (e.g. cp1252 on Windows)
+    with open(join(dirname(__file__), "README.rst"), encoding='utf-8') as f:
+        return f.read()
+
+
 class CustomInstall(install):
     def run(self):
         try:
@@ -88,7 +114,7 @@ setup(
     include_package_data=True,
     keywords=["log", "logging", "gui", "qt"],
     license="MIT",
-    long_description=open(join(dirname(__file__), "README.rst")).read(),
+    long_description=read_readme(),
     # package_data={"cutelog": ["styles/*", "ui/*"]}, # everything is in resources.py already
     data_files=[('share/applications', ['share/cutelog.desktop']),
                 ('share/pixmaps', ['share/cutelog.png'])],
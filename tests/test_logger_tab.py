@@ -0,0 +1,247 @@
+import logging
+import os
+import unittest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from qtpy.QtWidgets import QApplication  # noqa: E402
+
+APP = QApplication.instance() or QApplication([])
+
+import cutelog.resources  # noqa: E402,F401
+from cutelog.logger_tab import LogRecord  # noqa: E402
+from cutelog.main_window import MainWindow  # noqa: E402
+
+
+class NoServerMainWindow(MainWindow):
+    def start_server(self):
+        self.server = None
+
+    def stop_server(self):
+        pass
+
+
+def make_record(msg, created, name='app', levelname='INFO'):
+    return LogRecord({'msg': msg, 'created': created, 'name': name, 'levelname': levelname})
+
+
+class LoggerTabTestCase(unittest.TestCase):
+    def setUp(self):
+        self.window = NoServerMainWindow(logging.getLogger('test'), APP)
+        self.logger, _ = self.window.create_logger(None, 'tab')
+        self.record_model = self.logger.record_model
+        self.filter_model = self.logger.filter_model
+
+    def tearDown(self):
+        self.window.destroy_all_tabs()
+        self.window.deleteLater()
+
+    def messages(self):
+        return [record.message for record in self.record_model.records]
+
+    def visible_messages(self):
+        model = self.filter_model
+        return [self.logger.get_record(model.index(row, 0)).message
+                for row in range(model.rowCount())]
+
+
+class RecordFilterTest(LoggerTabTestCase):
+    def setUp(self):
+        super().setUp()
+        self.logger.merge_with_records([
+            make_record('server started', 0, 'app.server'),
+            make_record('Disk is FULL', 1, 'app.disk', 'WARNING'),
+            make_record('client connected', 2, 'app.server.client'),
+            make_record('debugging the disk', 3, 'app.disk', 'DEBUG'),
+            make_record('other app', 4, 'application'),
+        ])
+
+    def select_names(self, *paths):
+        tree = self.logger.namespace_tree_model
+        tree.selected_nodes = set(tree.registry[path] for path in paths)
+        self.filter_model.invalidateFilter()
+
+    def test_precomputed_rows_match_the_per_record_check(self):
+        self.filter_model.set_filter('disk', False, False, False)
+        expected = [r.message for r in self.record_model.records
+                    if self.filter_model.record_accepted(r)]
+        self.assertEqual(self.visible_messages(), expected)
+        self.assertEqual(expected, ['Disk is FULL', 'debugging the disk'])
+        # the answers are only valid during the refilter
+        self.assertIsNone(self.filter_model.accepted_rows)
+
+    def test_namespace_selection_includes_children(self):
+        self.select_names('app.server')
+        self.assertEqual(self.visible_messages(), ['server started', 'client connected'])
+
+    def test_namespace_selection_is_not_a_plain_prefix(self):
+        self.select_names('app')
+        self.assertNotIn('other app', self.visible_messages())
+
+    def test_namespace_selection_without_children(self):
+        self.filter_model.selection_includes_children = False
+        self.select_names('app.server')
+        self.assertEqual(self.visible_messages(), ['server started'])
+
+    def test_disabled_level_is_hidden(self):
+        self.logger.level_filter.levels['DEBUG'].enabled = False
+        self.filter_model.invalidateFilter()
+        self.assertNotIn('debugging the disk', self.visible_messages())
+        self.assertEqual(len(self.visible_messages()), 4)
+
+    def test_records_added_after_filtering_are_checked(self):
+        self.filter_model.set_filter('disk', False, False, False)
+        self.record_model.add_records([make_record('disk again', 5, 'app.disk'),
+                                       make_record('unrelated', 6)])
+        self.assertEqual(self.visible_messages(),
+                         ['Disk is FULL', 'debugging the disk', 'disk again'])
+
+    def test_plain_search_case_sensitivity(self):
+        self.filter_model.set_filter('FULL', False, False, True)
+        self.assertEqual(self.visible_messages(), ['Disk is FULL'])
+        self.filter_model.set_filter('full', False, False, True)
+        self.assertEqual(self.visible_messages(), [])
+        self.filter_model.set_filter('full', False, False, False)
+        self.assertEqual(self.visible_messages(), ['Disk is FULL'])
+
+    def test_regex_matches_anywhere(self):
+        self.filter_model.set_filter('dis?k', True, False, False)
+        self.assertEqual(self.visible_messages(), ['Disk is FULL', 'debugging the disk'])
+        self.filter_model.set_filter('^disk', True, False, True)
+        self.assertEqual(self.visible_messages(), [])
+
+    def test_wildcard_matches_whole_message(self):
+        self.filter_model.set_filter('disk*', False, True, False)
+        self.assertEqual(self.visible_messages(), ['Disk is FULL'])
+        self.filter_model.set_filter('*disk', False, True, False)
+        self.assertEqual(self.visible_messages(), ['debugging the disk'])
+
+    def test_invalid_regex_matches_nothing(self):
+        self.filter_model.set_filter('[', True, False, False)
+        self.assertEqual(self.visible_messages(), [])
+
+    def test_clear_filter_shows_everything(self):
+        self.filter_model.set_filter('disk', False, False, False)
+        self.filter_model.clear_filter()
+        self.assertEqual(len(self.visible_messages()), 5)
+
+    def find(self, text, regex=False, wildcard=False):
+        self.logger.searchLine.setText(text)
+        self.logger.search_regex = regex
+        self.logger.search_wildcard = wildcard
+        self.logger.search_casesensitive = False
+        self.logger.search_down()
+        return self.logger.loggerTable.currentIndex().row()
+
+    def test_find_matches_like_the_filter(self):
+        self.assertEqual(self.find('dis?k', regex=True), 1)
+        self.assertEqual(self.find('dis?k', regex=True), 3)
+        # wraps around to the top
+        self.assertEqual(self.find('dis?k', regex=True), 1)
+        self.assertEqual(self.find('*disk', wildcard=True), 3)
+
+
+class AddRecordsTest(LoggerTabTestCase):
+    def setUp(self):
+        super().setUp()
+        self.record_model.sort_by_time = True
+
+    def test_batch_is_sorted_without_changing_the_callers_list(self):
+        batch = [make_record('b', 2), make_record('a', 1), make_record('c', 3)]
+        self.assertEqual(self.record_model.add_records(batch), 0)
+        self.assertEqual(self.messages(), ['a', 'b', 'c'])
+        self.assertEqual([r.message for r in batch], ['b', 'a', 'c'])
+
+    def test_empty_batch(self):
+        self.record_model.add_records([make_record('a', 1)])
+        self.assertEqual(self.record_model.add_records([]), 1)
+        self.assertEqual(self.messages(), ['a'])
+
+    def test_newer_batch_is_appended(self):
+        self.record_model.add_records([make_record('a', 1), make_record('b', 2)])
+        self.assertEqual(self.record_model.add_records([make_record('c', 3)]), 2)
+        self.assertEqual(self.messages(), ['a', 'b', 'c'])
+
+    def test_older_records_are_inserted_in_order(self):
+        self.record_model.add_records([make_record('a', 1), make_record('d', 4)])
+        first_row = self.record_model.add_records([make_record('e', 5), make_record('b', 2)])
+        self.assertEqual(first_row, 1)
+        self.assertEqual(self.messages(), ['a', 'b', 'd', 'e'])
+
+    def test_unsorted_model_keeps_arrival_order(self):
+        self.record_model.sort_by_time = False
+        self.record_model.add_records([make_record('b', 2), make_record('a', 1)])
+        self.assertEqual(self.messages(), ['b', 'a'])
+
+    def test_trimmed_to_max_capacity(self):
+        self.logger.set_max_capacity(3)
+        self.record_model.add_records([make_record('a', 1), make_record('b', 2)])
+        self.record_model.add_records([make_record('c', 3), make_record('d', 4)])
+        self.assertEqual(self.messages(), ['b', 'c', 'd'])
+
+    def test_batch_larger_than_max_capacity(self):
+        self.logger.set_max_capacity(2)
+        self.record_model.add_records([make_record('a', 1)])
+        self.record_model.add_records([make_record(m, i) for i, m in enumerate('bcde', 2)])
+        self.assertEqual(self.messages(), ['d', 'e'])
+
+    def test_trim_if_needed(self):
+        self.record_model.add_records([make_record(m, i) for i, m in enumerate('abcde')])
+        self.record_model.max_capacity = 3
+        self.record_model.trim_if_needed(incoming=0)
+        self.assertEqual(self.messages(), ['c', 'd', 'e'])
+        self.record_model.trim_if_needed(incoming=2)
+        self.assertEqual(self.messages(), ['e'])
+        self.record_model.trim_if_needed(incoming=5)
+        self.assertEqual(self.messages(), [])
+
+    def test_pending_records_are_flushed_in_one_batch(self):
+        self.logger.on_record(make_record('b', 2, 'app.b'))
+        self.logger.on_record(make_record('a', 1, 'app.a', 'WARNING'))
+        self.assertEqual(self.messages(), [])
+        self.logger.flush_pending_records()
+        self.assertEqual(self.messages(), ['a', 'b'])
+        self.assertIn('app.b', self.logger.namespace_tree_model.registry)
+        self.assertIn('WARNING', self.logger.level_filter.levels)
+
+
+class MergeWithRecordsTest(LoggerTabTestCase):
+    def setUp(self):
+        super().setUp()
+        self.record_model.sort_by_time = True
+        self.record_model.add_records([make_record(m, i) for i, m in enumerate('aceg')])
+
+    def merge(self, records):
+        self.record_model.merge_with_records(records)
+        return self.messages()
+
+    def test_interleaved_merge(self):
+        new = [make_record('f', 2.5), make_record('b', 0.5), make_record('d', 1.5)]
+        self.assertEqual(self.merge(new), list('abcdefg'))
+
+    def test_newer_records_are_appended(self):
+        self.assertEqual(self.merge([make_record('i', 5), make_record('h', 4)]), list('aceghi'))
+
+    def test_interleaved_merge_is_capped(self):
+        self.record_model.max_capacity = 4
+        new = [make_record('f', 2.5), make_record('b', 0.5), make_record('d', 1.5)]
+        self.assertEqual(self.merge(new), list('defg'))
+
+    def test_appended_merge_is_capped(self):
+        self.record_model.max_capacity = 3
+        self.assertEqual(self.merge([make_record('h', 4), make_record('i', 5)]), ['g', 'h', 'i'])
+
+    def test_merge_larger_than_max_capacity(self):
+        self.record_model.max_capacity = 2
+        new = [make_record(m, i) for i, m in enumerate('hijk', 4)]
+        self.assertEqual(self.merge(new), ['j', 'k'])
+
+    def test_unsorted_merge_is_capped(self):
+        self.record_model.sort_by_time = False
+        self.record_model.max_capacity = 3
+        new = [make_record('f', 2.5), make_record('b', 0.5)]
+        self.assertEqual(self.merge(new), ['e', 'f', 'g'])
+
+
+if __name__ == '__main__':
+    unittest.main()
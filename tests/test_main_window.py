@@ -0,0 +1,149 @@
+import logging
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from qtpy.QtWidgets import QApplication  # noqa: E402
+
+APP = QApplication.instance() or QApplication([])
+
+import cutelog.resources  # noqa: E402,F401
+from cutelog.config import ORJSON_SUPPORT  # noqa: E402
+from cutelog.logger_tab import LogRecord  # noqa: E402
+from cutelog.main_window import LoadingThread, MainWindow  # noqa: E402
+from cutelog.pop_in_dialog import PopInDialog  # noqa: E402
+
+
+class NoServerMainWindow(MainWindow):
+    def start_server(self):
+        self.server = None
+
+    def stop_server(self):
+        pass
+
+
+class SaveAndLoadRecordsTest(unittest.TestCase):
+    def setUp(self):
+        self.window = NoServerMainWindow(logging.getLogger('test'), APP)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.window.destroy_all_tabs()
+        self.window.deleteLater()
+        self.tmp_dir.cleanup()
+
+    def save_and_load(self, rec_dicts, file_name):
+        logger, _ = self.window.create_logger(None, 'src')
+        logger.merge_with_records([LogRecord(d) for d in rec_dicts])
+        path = os.path.join(self.tmp_dir.name, file_name)
+        self.window.save_records(logger, path)
+
+        results = []
+        thread = LoadingThread(path, self.window.log)
+        thread.done_loading.connect(results.append)
+        thread.loading_error.connect(self.fail)
+        thread.run()
+        name, records = results[0]
+        self.assertEqual(name, file_name)
+        return records
+
+    def check_round_trip(self, file_name):
+        messages = ['plain ascii', 'naïve café', 'Привет, мир', '日本語 ✓']
+        rec_dicts = [{'msg': msg, 'name': 'a.b', 'levelname': 'INFO', 'created': i}
+                     for i, msg in enumerate(messages)]
+        records = self.save_and_load(rec_dicts, file_name)
+        self.assertEqual([r.message for r in records], messages)
+        self.assertEqual([r.created for r in records], [0, 1, 2, 3])
+
+    @unittest.skipUnless(ORJSON_SUPPORT, 'orjson is not installed')
+    def test_round_trip_with_orjson(self):
+        self.check_round_trip('records.json')
+
+    def test_round_trip_with_json(self):
+        with mock.patch('cutelog.main_window.ORJSON_SUPPORT', False):
+            self.check_round_trip('records.json')
+
+    @unittest.skipUnless(ORJSON_SUPPORT, 'orjson is not installed')
+    def test_round_trip_as_lines_with_orjson(self):
+        self.check_round_trip('records.jsonl')
+
+    def test_round_trip_as_lines_with_json(self):
+        with mock.patch('cutelog.main_window.ORJSON_SUPPORT', False):
+            self.check_round_trip('records.jsonl')
+
+    def test_non_string_keys_as_lines(self):
+        # orjson rejects non-string keys, so this record is written by the json fallback
+        rec_dicts = [{'msg': 'ключ', 'name': 'a', 'levelname': 'INFO', 'created': 0, 5: 'five'},
+                     {'msg': 'after', 'name': 'a', 'levelname': 'INFO', 'created': 1}]
+        records = self.save_and_load(rec_dicts, 'records.jsonl')
+        self.assertEqual([r.message for r in records], ['ключ', 'after'])
+        self.assertEqual(records[0]._logDict['5'], 'five')
+
+    def test_load_lines_skips_blank_lines(self):
+        path = os.path.join(self.tmp_dir.name, 'blank.jsonl')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n{"msg": "first", "created": 0}\n\n  \n{"msg": "второй", "created": 1}\n\n')
+        thread = LoadingThread(path, self.window.log)
+        with open(path, encoding='utf-8') as f:
+            records = thread.load(f)
+        self.assertEqual([r.message for r in records], ['first', 'второй'])
+
+
+class MergePoppedOutTabTest(unittest.TestCase):
+    def setUp(self):
+        self.window = NoServerMainWindow(logging.getLogger('test'), APP)
+
+    def tearDown(self):
+        self.window.destroy_all_tabs()
+        self.window.deleteLater()
+
+    def test_merged_popped_out_tab_is_not_offered_for_pop_in(self):
+        window = self.window
+        window.create_logger(None, 'dst')
+        _, index = window.create_logger(None, 'src')
+        window.loggerTabWidget.setCurrentIndex(index)
+        window.pop_out_tab()
+        self.assertIn('src', window.popped_out_loggers)
+
+        window.merge_tabs('dst', ['src'], True)
+
+        self.assertNotIn('src', window.popped_out_loggers)
+        dialog = PopInDialog(window, tuple(window.popped_out_loggers.values()))
+        self.assertEqual(dialog.listWidget.count(), 0)
+        window.pop_in_tabs([dialog.listWidget.item(i).text()
+                            for i in range(dialog.listWidget.count())])
+        self.assertFalse(window.actionPopIn.isEnabled())
+
+
+class UniqueLoggerNameTest(unittest.TestCase):
+    def setUp(self):
+        self.window = NoServerMainWindow(logging.getLogger('test'), APP)
+
+    def tearDown(self):
+        self.window.destroy_all_tabs()
+        self.window.deleteLater()
+
+    def create(self, count=1):
+        return [self.window.create_logger(None, 'conn')[0] for _ in range(count)]
+
+    def test_numbering_continues_from_the_last_number(self):
+        names = [logger.name for logger in self.create(4)]
+        self.assertEqual(names, ['conn', 'conn 1', 'conn 2', 'conn 3'])
+        self.assertEqual(self.window.name_counters['conn'], 4)
+
+    def test_closed_tab_number_is_reused(self):
+        loggers = self.create(3)
+        self.window.close_tab(self.window.loggerTabWidget.indexOf(loggers[1]))
+        self.assertEqual([logger.name for logger in self.create(2)], ['conn 1', 'conn 3'])
+
+    def test_renamed_tab_number_is_reused(self):
+        loggers = self.create(3)
+        self.window.rename_tab(loggers[1], 'renamed')
+        self.assertEqual([logger.name for logger in self.create(2)], ['conn 1', 'conn 3'])
+
+
+if __name__ == '__main__':
+    unittest.main()
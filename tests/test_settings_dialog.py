@@ -0,0 +1,67 @@
+import os
+import unittest
+from unittest import mock
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from qtpy.QtWidgets import QApplication  # noqa: E402
+
+APP = QApplication.instance() or QApplication([])
+
+import cutelog.resources  # noqa: E402,F401
+from cutelog.config import CONFIG  # noqa: E402
+from cutelog.settings_dialog import SettingsDialog  # noqa: E402
+
+
+class SaveToConfigTest(unittest.TestCase):
+    def setUp(self):
+        self.dialog = SettingsDialog(None)
+        self.dialog.load_from_config()
+        # fonts that aren't installed come back from the dialog as a substitute,
+        # so the substitutes are made the current options to start from no changes
+        with mock.patch.object(CONFIG, 'update_options') as update_options:
+            self.dialog.save_to_config()
+        substitutes = update_options.call_args[0][0] if update_options.called else {}
+        options_patcher = mock.patch.dict(CONFIG.options, substitutes)
+        options_patcher.start()
+        self.addCleanup(options_patcher.stop)
+        self.dialog.server_restart_needed = False
+
+    def tearDown(self):
+        self.dialog.deleteLater()
+
+    def save(self):
+        with mock.patch.object(CONFIG, 'update_options') as update_options:
+            self.dialog.save_to_config()
+        if not update_options.called:
+            return None
+        return update_options.call_args[0][0]
+
+    def test_nothing_is_saved_without_changes(self):
+        self.assertIsNone(self.save())
+        self.assertFalse(self.dialog.server_restart_needed)
+
+    def test_only_changed_options_are_saved(self):
+        row_height = CONFIG['logger_row_height'] + 5
+        self.dialog.loggerTableRowHeight.setValue(row_height)
+        self.dialog.benchmarkCheckBox.setChecked(not CONFIG['benchmark'])
+        self.assertEqual(self.save(), {'logger_row_height': row_height,
+                                       'benchmark': not CONFIG['benchmark']})
+        self.assertFalse(self.dialog.server_restart_needed)
+
+    def test_changing_the_port_needs_a_server_restart(self):
+        port = CONFIG['listen_port'] + 1
+        self.dialog.listenPortLine.setText(str(port))
+        self.assertEqual(self.save(), {'listen_port': port})
+        self.assertTrue(self.dialog.server_restart_needed)
+
+    def test_update_options_writes_only_the_given_options(self):
+        value = not CONFIG['benchmark']
+        with mock.patch.object(CONFIG, 'qsettings') as qsettings:
+            CONFIG.update_options({'benchmark': value})
+        qsettings.setValue.assert_called_once_with('benchmark', value)
+        self.assertEqual(CONFIG['benchmark'], value)
+
+
+if __name__ == '__main__':
+    unittest.main()